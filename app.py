@@ -1,11 +1,50 @@
 import streamlit as st
 import os
-from datetime import datetime
-from utils.data_collection import collect_user_data
-from utils.cv_generator import generate_cv_pdf
+from datetime import datetime, date
+from utils.data_collection import collect_form_data, validate_user_data
+from utils.cv_generator import pdf_content_hash
+from utils.renderers import render_formats
 from utils.encryption import encrypt_pdf
-from utils.dropbox_handler import upload_to_dropbox
+from utils.encryption_policy import load_policy, derive_document_key
+from utils.dropbox_handler import DropboxStorage
+from utils.storage import LocalStorage, S3Storage, DedupStorage, FOLDER_LAYOUTS, shard_folder
 from utils.auth import check_authentication, logout
+from utils.session_store import SQLiteSessionStore, DEFAULT_STORE_PATH
+from utils.scratch import scratch_dir, check_scratch_quota, start_janitor
+from utils.preview import show_preview
+
+@st.cache_resource
+def get_session_store():
+    """Shared store for in-progress wizard state (SQLite, so replicas on this host only)"""
+    try:
+        store_path = st.secrets.get("session", {}).get("store_path", DEFAULT_STORE_PATH)
+    except FileNotFoundError:
+        # No secrets file: the session section is optional
+        store_path = DEFAULT_STORE_PATH
+    return SQLiteSessionStore(store_path)
+
+@st.cache_resource
+def get_encryption_policy():
+    """PDF encryption policy from the [encryption] secrets section"""
+    try:
+        config = st.secrets.get("encryption", {})
+    except FileNotFoundError:
+        # No secrets file: the encryption section is optional, use the defaults
+        config = {}
+    return load_policy(config)
+
+EXTRA_FORMAT_MIME_TYPES = {
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "html": "text/html",
+}
+
+def save_wizard_state():
+    """Persist step and user_data so another replica can resume the session"""
+    if st.session_state.get('session_id'):
+        get_session_store().save(st.session_state.session_id, {
+            'step': st.session_state.step,
+            'user_data': st.session_state.user_data
+        })
 
 def main():
     st.set_page_config(
@@ -14,117 +53,198 @@ def main():
         layout="wide"
     )
     
+    # Reap temp files and expired sessions left behind by abandoned requests
+    start_janitor(tasks=[get_session_store().purge_expired])
+    
     # Check authentication first
-    if not check_authentication():
+    if not check_authentication(get_session_store()):
         return
     
     # Show logout option in sidebar
     with st.sidebar:
         st.markdown("---")
         if st.button("🚪 Logout", help="Logout and return to authentication"):
-            logout()
+            for key in ('step', 'user_data'):
+                st.session_state.pop(key, None)
+            logout(get_session_store())
             st.rerun()
     
     st.title("📄 Professional CV Generator")
     st.markdown("---")
     
-    # Initialize session state
+    # Initialize session state, resuming saved wizard state if there is any
     if 'step' not in st.session_state:
-        st.session_state.step = 1
+        saved = None
+        if st.session_state.get('session_id'):
+            saved = get_session_store().load(st.session_state.session_id)
+        st.session_state.step = saved['step'] if saved else 1
+        st.session_state.user_data = saved['user_data'] if saved else {}
     if 'user_data' not in st.session_state:
         st.session_state.user_data = {}
     
-    # Sidebar for Dropbox configuration
+    # Sidebar for storage configuration
+    storage = None
     with st.sidebar:
         st.header("⚙️ Configuration")
-        dropbox_token = st.text_input("Dropbox Access Token", type="password")
-        dropbox_folder = st.text_input("Dropbox Folder Path", value="/CVs")
+        storage_type = st.selectbox("Storage Backend", ["Dropbox", "Local Folder", "S3-Compatible"])
         
-        if st.button("Test Dropbox Connection"):
+        if storage_type == "Dropbox":
+            dropbox_token = st.text_input("Dropbox Access Token", type="password")
+            storage_folder = st.text_input("Dropbox Folder Path", value="/CVs")
+            
+            if st.button("Test Dropbox Connection"):
+                if dropbox_token:
+                    try:
+                        from utils.dropbox_handler import test_connection
+                        if test_connection(dropbox_token):
+                            st.success("✅ Dropbox connection successful!")
+                        else:
+                            st.error("❌ Dropbox connection failed!")
+                    except Exception as e:
+                        st.error(f"❌ Error: {str(e)}")
+                else:
+                    st.warning("Please enter Dropbox access token")
+            
             if dropbox_token:
+                storage = DropboxStorage(dropbox_token)
+        
+        elif storage_type == "Local Folder":
+            storage_root = st.text_input("Storage Directory", value="storage")
+            storage_folder = st.text_input("Folder Path", value="/CVs")
+            if storage_root:
+                storage = LocalStorage(storage_root)
+        
+        else:
+            s3_endpoint = st.text_input("Endpoint URL", placeholder="http://localhost:9000")
+            s3_bucket = st.text_input("Bucket")
+            s3_access_key = st.text_input("Access Key")
+            s3_secret_key = st.text_input("Secret Key", type="password")
+            storage_folder = st.text_input("Folder Path", value="/CVs")
+            if s3_bucket:
                 try:
-                    from utils.dropbox_handler import test_connection
-                    if test_connection(dropbox_token):
-                        st.success("✅ Dropbox connection successful!")
-                    else:
-                        st.error("❌ Dropbox connection failed!")
+                    storage = S3Storage(
+                        s3_bucket,
+                        endpoint_url=s3_endpoint or None,
+                        access_key=s3_access_key or None,
+                        secret_key=s3_secret_key or None
+                    )
                 except Exception as e:
                     st.error(f"❌ Error: {str(e)}")
-            else:
-                st.warning("Please enter Dropbox access token")
+        
+        folder_layout = st.selectbox(
+            "Folder Layout",
+            list(FOLDER_LAYOUTS),
+            help="Shard uploads into dated / hash-prefixed subfolders to keep folders small"
+        )
+        
+        extra_formats = st.multiselect(
+            "Extra Output Formats",
+            ["docx", "html"],
+            help="Unencrypted Word/HTML versions offered for download alongside the PDF"
+        )
+        
+        # Skip re-uploading CVs whose content has not changed
+        if storage:
+            storage = DedupStorage(storage, os.path.join("data", "upload_index.db"))
     
     # Main application flow
     if st.session_state.step == 1:
         st.header("📝 Personal Information")
-        user_data = collect_user_data()
+        form_data = collect_form_data()
+        user_data = form_data if validate_user_data(form_data) else None
         
         if user_data and st.button("Generate CV", type="primary"):
             st.session_state.user_data = user_data
             st.session_state.step = 2
+            save_wizard_state()
             st.rerun()
+        
+        # Cheap in-memory preview of the form as it is being filled in
+        show_preview(form_data)
     
     elif st.session_state.step == 2:
         st.header("🔄 Generating Your CV...")
         
         try:
-            # Generate CV PDF
-            with st.spinner("Creating PDF..."):
-                pdf_path = generate_cv_pdf(st.session_state.user_data)
-            
-            # Encrypt PDF with DOB
-            with st.spinner("Securing PDF..."):
-                dob = st.session_state.user_data['dob']
-                password = dob.strftime("%d%m%Y")  # Format: DDMMYYYY
-                encrypted_pdf_path = encrypt_pdf(pdf_path, password)
-            
-            # Generate filename
-            name = st.session_state.user_data['name'].replace(" ", "-")
-            phone = st.session_state.user_data['phone']
-            final_filename = f"{name}-{phone}.pdf"
-            
-            # Rename file
-            final_path = os.path.join(os.path.dirname(encrypted_pdf_path), final_filename)
-            os.rename(encrypted_pdf_path, final_path)
-            
-            st.success("✅ CV generated successfully!")
-            
-            # Display download option
-            with open(final_path, "rb") as file:
-                st.download_button(
-                    label="📥 Download CV",
-                    data=file.read(),
-                    file_name=final_filename,
-                    mime="application/pdf"
-                )
-            
-            # Upload to Dropbox if configured
-            if dropbox_token and dropbox_folder:
-                with st.spinner("Uploading to Dropbox..."):
-                    success = upload_to_dropbox(final_path, dropbox_token, dropbox_folder, final_filename)
-                    if success:
-                        st.success("✅ CV uploaded to Dropbox successfully!")
-                    else:
-                        st.error("❌ Failed to upload to Dropbox")
+            # All temp files live in a per-request directory removed on exit
+            with scratch_dir() as work_dir:
+                # Generate CV PDF (and any extra formats from the same layout model)
+                with st.spinner("Creating PDF..."):
+                    outputs = render_formats(
+                        st.session_state.user_data,
+                        work_dir,
+                        formats=["pdf"] + extra_formats,
+                        generated_on=date.today(),
+                        reproducible=True
+                    )
+                    pdf_path = outputs["pdf"]
+                check_scratch_quota(work_dir)
+                
+                # Encrypt PDF (password from the encryption policy, DOB by default)
+                with st.spinner("Securing PDF..."):
+                    encryption_policy = get_encryption_policy()
+                    # Encryption adds random IDs, so dedup on the plain PDF plus the policy
+                    content_hash = f"{pdf_content_hash(pdf_path)}:{encryption_policy.fingerprint()}"
+                    document_key = derive_document_key(encryption_policy, st.session_state.user_data)
+                    password = document_key.user_password
+                    encrypted_pdf_path = encrypt_pdf(pdf_path, document_key=document_key)
+                check_scratch_quota(work_dir)
+                
+                # Generate filename
+                name = st.session_state.user_data['name'].replace(" ", "-")
+                phone = st.session_state.user_data['phone']
+                final_filename = f"{name}-{phone}.pdf"
+                
+                # Rename file
+                final_path = os.path.join(work_dir, final_filename)
+                os.rename(encrypted_pdf_path, final_path)
+                
+                st.success("✅ CV generated successfully!")
+                
+                # Display download option
+                with open(final_path, "rb") as file:
+                    st.download_button(
+                        label="📥 Download CV",
+                        data=file.read(),
+                        file_name=final_filename,
+                        mime="application/pdf"
+                    )
+                
+                for output_format in extra_formats:
+                    with open(outputs[output_format], "rb") as file:
+                        st.download_button(
+                            label=f"📥 Download CV ({output_format.upper()})",
+                            data=file.read(),
+                            file_name=f"{name}-{phone}.{output_format}",
+                            mime=EXTRA_FORMAT_MIME_TYPES[output_format]
+                        )
+                
+                # Upload to storage if configured
+                if storage and storage_folder:
+                    with st.spinner(f"Uploading to {storage_type}..."):
+                        upload_folder = shard_folder(storage_folder, final_filename, folder_layout)
+                        success = storage.ensure_folders([upload_folder]) and storage.put_file(
+                            final_path, upload_folder, final_filename, content_hash=content_hash
+                        )
+                        if success:
+                            st.success(f"✅ CV uploaded to {storage_type} successfully!")
+                        else:
+                            st.error(f"❌ Failed to upload to {storage_type}")
             
             # Show CV details
-            st.info(f"🔐 PDF Password: {password} (Your Date of Birth in DDMMYYYY format)")
-            
-            # Clean up temporary files
-            try:
-                os.remove(pdf_path)
-                os.remove(final_path)
-            except:
-                pass
+            st.info(f"🔐 PDF Password: {password} ({encryption_policy.password_hint()})")
             
             if st.button("Generate Another CV"):
                 st.session_state.step = 1
                 st.session_state.user_data = {}
+                save_wizard_state()
                 st.rerun()
                 
         except Exception as e:
             st.error(f"❌ Error generating CV: {str(e)}")
             if st.button("Try Again"):
                 st.session_state.step = 1
+                save_wizard_state()
                 st.rerun()
 
 if __name__ == "__main__":
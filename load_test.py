@@ -0,0 +1,257 @@
+# load_test.py
+"""
+Load test for the CV generator
+
+Drives the full step 1 -> step 2 flow of app.py headlessly with
+Streamlit's AppTest, for N simulated users, with Dropbox calls answered
+by a local mock. Reports end-to-end and per-stage latency percentiles
+and RSS growth.
+
+AppTest swaps in a process-global fake runtime while a script runs, so
+concurrent users run in separate worker processes (one user at a time
+per worker) rather than threads.
+
+Usage:
+    python load_test.py --users 20 --concurrency 5
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+
+from streamlit import logger as streamlit_logger
+from streamlit.testing.v1 import AppTest
+
+import utils.dropbox_handler
+import utils.encryption
+import utils.preview
+import utils.renderers
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+
+# Per-worker state
+_timings = defaultdict(list)
+_timings_lock = threading.Lock()
+_rss_baseline = 0
+
+
+def _record(stage, seconds):
+    with _timings_lock:
+        _timings[stage].append(seconds)
+
+
+def _timed(stage, func):
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _record(stage, time.perf_counter() - started)
+    return wrapper
+
+
+class MockDropbox:
+    """Stands in for dropbox.Dropbox; uploads just sleep for the configured latency"""
+
+    def __init__(self, latency):
+        self.latency = latency
+
+    def users_get_current_account(self):
+        time.sleep(self.latency)
+
+    def files_upload(self, data, path, **kwargs):
+        time.sleep(self.latency)
+        return SimpleNamespace(name=path.rsplit('/', 1)[-1], rev="mock", size=len(data))
+
+    def files_create_folder_batch(self, paths, autorename=False):
+        from dropbox import files
+        time.sleep(self.latency)
+        entries = [
+            files.CreateFolderBatchResultEntry.success(
+                files.CreateFolderEntryResult(files.FolderMetadata(name=path.rsplit('/', 1)[-1]))
+            )
+            for path in paths
+        ]
+        return files.CreateFolderBatchLaunch.complete(files.CreateFolderBatchResult(entries=entries))
+
+
+def install_instrumentation(dropbox_latency, work_dir):
+    """Point Dropbox at the mock and wrap each pipeline stage with a timer"""
+
+    global _rss_baseline
+    # Keep the app's data/ (session store, upload index) separate from the real one
+    os.chdir(work_dir)
+    _rss_baseline = current_rss()
+    # Bare-mode AppTest logs a warning per widget otherwise
+    streamlit_logger.set_log_level("error")
+
+    utils.dropbox_handler._client = lambda access_token: MockDropbox(dropbox_latency)
+    utils.renderers.render_formats = _timed("render", utils.renderers.render_formats)
+    utils.encryption.encrypt_pdf = _timed("encrypt", utils.encryption.encrypt_pdf)
+    utils.dropbox_handler.upload_to_dropbox = _timed("upload", utils.dropbox_handler.upload_to_dropbox)
+    utils.dropbox_handler.create_folders = _timed("create_folders", utils.dropbox_handler.create_folders)
+    utils.preview.render_preview_png = _timed("preview", utils.preview.render_preview_png)
+
+
+def _widget(widgets, label):
+    for widget in widgets:
+        if widget.label == label:
+            return widget
+    raise LookupError(f"Widget not found: {label}")
+
+
+def simulate_user(user_number, timeout):
+    """
+    Run one user through data entry and CV generation
+
+    Returns:
+        dict: End-to-end latency, per-stage timings and worker RSS
+    """
+
+    with _timings_lock:
+        _timings.clear()
+    # AppTest leaves app.py installed as __main__; the worker needs this module back
+    # to unpickle the next task
+    main_module = sys.modules["__main__"]
+    try:
+        return _run_user(user_number, timeout)
+    finally:
+        sys.modules["__main__"] = main_module
+
+
+def _run_user(user_number, timeout):
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    at.session_state["authenticated"] = True
+
+    started = time.perf_counter()
+    at.run()
+
+    # Step 1: fill in the form
+    _widget(at.sidebar.text_input, "Dropbox Access Token").input("mock-token")
+    _widget(at.text_input, "Full Name *").input(f"Load Test User {user_number}")
+    _widget(at.text_input, "Phone Number *").input(f"90000{user_number:05d}")
+    _widget(at.text_input, "Father's Name *").input("Parent Name")
+    at.text_input(key="board_10th").input("State Board")
+    at.run()
+    step_one = time.perf_counter()
+    _record("step1_form", step_one - started)
+
+    # Step 2: generate, encrypt and upload
+    _widget(at.button, "Generate CV").click()
+    at.run()
+    _record("step2_generate", time.perf_counter() - step_one)
+
+    if at.exception or not any("generated successfully" in s.value for s in at.success):
+        errors = [e.value for e in at.error] + [str(e.value) for e in at.exception]
+        raise RuntimeError(f"User {user_number} failed: {errors}")
+
+    return {
+        "latency": time.perf_counter() - started,
+        "stages": dict(_timings),
+        "pid": os.getpid(),
+        "rss_baseline": _rss_baseline,
+        "rss": current_rss(),
+    }
+
+
+def current_rss():
+    """Resident set size of this process in bytes"""
+
+    with open("/proc/self/statm") as file:
+        return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def percentiles(values):
+    if len(values) < 2:
+        value = values[0] if values else 0.0
+        return value, value, value
+    cuts = statistics.quantiles(values, n=100, method="inclusive")
+    return statistics.median(values), cuts[94], cuts[98]
+
+
+def run_load_test(users, concurrency, dropbox_latency=0.05, timeout=120):
+    """
+    Run the load test and return a report
+
+    Args:
+        users (int): Number of simulated users
+        concurrency (int): Users running at the same time (worker processes)
+        dropbox_latency (float): Seconds each mocked Dropbox call takes
+        timeout (float): AppTest timeout per script run
+
+    Returns:
+        dict: Latency percentiles, per-stage breakdown and RSS figures
+    """
+
+    started = time.perf_counter()
+    latencies, failures = [], []
+    stages = defaultdict(list)
+    workers = {}
+
+    with tempfile.TemporaryDirectory(prefix="cv_load_test_") as work_dir, ProcessPoolExecutor(
+        max_workers=concurrency, initializer=install_instrumentation, initargs=(dropbox_latency, work_dir)
+    ) as executor:
+        futures = [executor.submit(simulate_user, i, timeout) for i in range(users)]
+        for future in futures:
+            try:
+                result = future.result()
+            except Exception as e:
+                failures.append(str(e))
+                continue
+            latencies.append(result["latency"])
+            for stage, values in result["stages"].items():
+                stages[stage].extend(values)
+            baseline, peak = workers.get(result["pid"], (result["rss_baseline"], 0))
+            workers[result["pid"]] = (baseline, max(peak, result["rss"]))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "users": users,
+        "concurrency": concurrency,
+        "failures": failures,
+        "elapsed_seconds": elapsed,
+        "throughput_per_second": len(latencies) / elapsed if elapsed else 0.0,
+        "latency": percentiles(latencies),
+        "stages": {stage: (len(values),) + percentiles(values) for stage, values in sorted(stages.items())},
+        "rss_baseline_mb": max((b for b, _ in workers.values()), default=0) / 2**20,
+        "rss_peak_mb": max((p for _, p in workers.values()), default=0) / 2**20,
+        "rss_growth_mb": max((p - b for b, p in workers.values()), default=0) / 2**20,
+    }
+
+
+def print_report(report):
+    p50, p95, p99 = report["latency"]
+    print(f"Users: {report['users']}  Concurrency: {report['concurrency']}  "
+          f"Failures: {len(report['failures'])}")
+    print(f"Elapsed: {report['elapsed_seconds']:.2f}s  "
+          f"Throughput: {report['throughput_per_second']:.2f} users/s")
+    print(f"End-to-end latency  p50={p50:.3f}s  p95={p95:.3f}s  p99={p99:.3f}s")
+    print("Per-stage latency:")
+    for stage, (count, s50, s95, s99) in report["stages"].items():
+        print(f"  {stage:<16} n={count:<5} p50={s50:.3f}s  p95={s95:.3f}s  p99={s99:.3f}s")
+    print(f"Worker RSS: baseline={report['rss_baseline_mb']:.1f}MB  peak={report['rss_peak_mb']:.1f}MB  "
+          f"max growth={report['rss_growth_mb']:+.1f}MB")
+    for failure in report["failures"][:5]:
+        print(f"  ! {failure}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the CV generator app")
+    parser.add_argument("--users", type=int, default=10, help="Number of simulated users")
+    parser.add_argument("--concurrency", type=int, default=4, help="Users running at the same time")
+    parser.add_argument("--dropbox-latency", type=float, default=0.05,
+                        help="Seconds each mocked Dropbox call takes")
+    parser.add_argument("--timeout", type=float, default=120, help="Timeout per script run in seconds")
+    args = parser.parse_args()
+
+    print_report(run_load_test(args.users, args.concurrency, args.dropbox_latency, args.timeout))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+# tests/test_async_dropbox.py
+import asyncio
+import json
+import os
+import time
+
+import httpx
+import pytest
+
+import utils.async_dropbox as async_dropbox
+from utils.async_dropbox import AsyncDropboxClient, upload_many
+from utils.rate_limiter import AsyncAdaptiveLimiter
+
+
+class FakeDropboxServer:
+    """Minimal in-memory Dropbox HTTP API, served through httpx.MockTransport"""
+
+    def __init__(self, throttle=(), latency=0.0):
+        self.files = {}
+        self.folders = {"/CVs"}
+        self.sessions = {}
+        self.requests = []
+        # Retry-After values for the next requests; None sends no header
+        self.throttle = list(throttle)
+        self.latency = latency
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.peak_open_fds = 0
+
+    def transport(self):
+        return httpx.MockTransport(self.handle)
+
+    async def handle(self, request):
+        endpoint = request.url.path.removeprefix("/2/")
+        self.requests.append(endpoint)
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        self.peak_open_fds = max(self.peak_open_fds, len(os.listdir("/proc/self/fd")))
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            if self.throttle:
+                retry_after = self.throttle.pop(0)
+                headers = {"Retry-After": str(retry_after)} if retry_after is not None else {}
+                return httpx.Response(429, headers=headers, json={"error_summary": "too_many_requests/"})
+            return getattr(self, endpoint.replace("/", "_"))(request)
+        finally:
+            self.in_flight -= 1
+
+    def _arg(self, request):
+        return json.loads(request.headers["Dropbox-API-Arg"])
+
+    def files_upload(self, request):
+        path = self._arg(request)["path"]
+        self.files[path] = request.content
+        return httpx.Response(200, json={"name": path.rsplit("/", 1)[-1], "path_display": path, "rev": "1"})
+
+    def files_upload_session_start(self, request):
+        session_id = f"session-{len(self.sessions)}"
+        self.sessions[session_id] = request.content
+        return httpx.Response(200, json={"session_id": session_id})
+
+    def files_upload_session_append_v2(self, request):
+        cursor = self._arg(request)["cursor"]
+        assert cursor["offset"] == len(self.sessions[cursor["session_id"]])
+        self.sessions[cursor["session_id"]] += request.content
+        # The real endpoint answers with a JSON null
+        return httpx.Response(200, content=b"null")
+
+    def files_upload_session_finish(self, request):
+        arg = self._arg(request)
+        cursor = arg["cursor"]
+        assert cursor["offset"] == len(self.sessions[cursor["session_id"]])
+        path = arg["commit"]["path"]
+        self.files[path] = self.sessions.pop(cursor["session_id"]) + request.content
+        return httpx.Response(200, json={"name": path.rsplit("/", 1)[-1], "path_display": path, "rev": "2"})
+
+    def files_create_folder_v2(self, request):
+        path = json.loads(request.content)["path"]
+        if path in self.folders:
+            return httpx.Response(409, json={"error_summary": "path/conflict/folder/..."})
+        if not path.startswith("/"):
+            return httpx.Response(409, json={"error_summary": "path/malformed_path/..."})
+        self.folders.add(path)
+        return httpx.Response(200, json={"metadata": {"path_display": path}})
+
+    def files_list_folder(self, request):
+        # Two pages: the first points at the second through the cursor
+        return httpx.Response(200, json={
+            "entries": [{".tag": "file", "name": "a.pdf"}, {".tag": "folder", "name": "2026"}],
+            "cursor": "page-2",
+            "has_more": True
+        })
+
+    def files_list_folder_continue(self, request):
+        assert json.loads(request.content)["cursor"] == "page-2"
+        return httpx.Response(200, json={
+            "entries": [{".tag": "file", "name": "b.pdf"}],
+            "cursor": "end",
+            "has_more": False
+        })
+
+    def users_get_current_account(self, request):
+        return httpx.Response(200, json={"account_id": "dbid:test"})
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def client_for(server, **options):
+    return AsyncDropboxClient("token", transport=server.transport(), **options)
+
+
+def test_upload_file(tmp_path):
+    server = FakeDropboxServer()
+    local_file = tmp_path / "cv.pdf"
+    local_file.write_bytes(b"%PDF-1.4 small")
+
+    async def scenario():
+        async with client_for(server) as client:
+            return await client.upload_file(str(local_file), "CVs", "cv.pdf")
+
+    metadata = run(scenario())
+    assert metadata["path_display"] == "/CVs/cv.pdf"
+    assert server.files["/CVs/cv.pdf"] == b"%PDF-1.4 small"
+    assert server.requests == ["files/upload"]
+
+
+def test_large_file_uses_upload_session(tmp_path, monkeypatch):
+    monkeypatch.setattr(async_dropbox, "SIMPLE_UPLOAD_LIMIT", 10)
+    monkeypatch.setattr(async_dropbox, "CHUNK_SIZE", 4)
+    server = FakeDropboxServer()
+    content = b"0123456789abcdefghij-tail"
+    local_file = tmp_path / "big.pdf"
+    local_file.write_bytes(content)
+
+    async def scenario():
+        async with client_for(server) as client:
+            return await client.upload_file(str(local_file), "/CVs/", "big.pdf")
+
+    metadata = run(scenario())
+    assert metadata["rev"] == "2"
+    assert server.files["/CVs/big.pdf"] == content
+    assert server.requests[0] == "files/upload_session/start"
+    assert server.requests[-1] == "files/upload_session/finish"
+    assert server.requests.count("files/upload_session/append_v2") == 5
+
+
+def test_list_files_follows_has_more():
+    server = FakeDropboxServer()
+
+    async def scenario():
+        async with client_for(server) as client:
+            return await client.list_files("/CVs")
+
+    assert run(scenario()) == ["a.pdf", "b.pdf"]
+    assert server.requests == ["files/list_folder", "files/list_folder/continue"]
+
+
+def test_create_folder_treats_conflict_as_existing():
+    server = FakeDropboxServer()
+
+    async def scenario():
+        async with client_for(server) as client:
+            return (
+                await client.create_folder("/CVs"),
+                await client.create_folder("New"),
+                await client.create_folder(""),
+            )
+
+    existing, created, malformed = run(scenario())
+    assert existing is True
+    assert created is True and "/New" in server.folders
+    assert malformed is False
+
+
+def test_retry_after_shrinks_concurrency_limit(tmp_path):
+    server = FakeDropboxServer(throttle=[0.2])
+    local_file = tmp_path / "cv.pdf"
+    local_file.write_bytes(b"data")
+    limiter = AsyncAdaptiveLimiter(initial_limit=8)
+
+    async def scenario():
+        async with client_for(server, limiter=limiter) as client:
+            return await client.upload_file(str(local_file), "/CVs", "cv.pdf")
+
+    started = time.monotonic()
+    assert run(scenario()) is not None
+    assert time.monotonic() - started >= 0.2
+    metrics = limiter.metrics()
+    assert metrics["throttled"] == 1
+    assert metrics["concurrency_limit"] == 4
+    assert server.requests == ["files/upload", "files/upload"]
+
+
+def test_test_connection():
+    async def scenario(server):
+        async with client_for(server) as client:
+            return await client.test_connection()
+
+    assert run(scenario(FakeDropboxServer()))
+    assert not run(scenario(FakeDropboxServer(throttle=[0.01] * 10)))
+
+
+def test_upload_many_bounds_open_files(tmp_path):
+    server = FakeDropboxServer(latency=0.001)
+    items = []
+    for i in range(1500):
+        local_file = tmp_path / f"cv_{i}.pdf"
+        local_file.write_bytes(f"cv {i}".encode())
+        items.append((str(local_file), "/CVs", f"cv_{i}.pdf"))
+    baseline_fds = len(os.listdir("/proc/self/fd"))
+
+    results = upload_many(items, "token", max_connections=16, transport=server.transport())
+
+    assert all(results)
+    assert len(server.files) == 1500
+    assert server.peak_in_flight <= 16
+    # Open files stay bounded by the connection count, not the number of items
+    assert server.peak_open_fds - baseline_fds < 64
@@ -0,0 +1,58 @@
+# tests/test_auth.py
+from types import SimpleNamespace
+
+import pytest
+
+import utils.auth as auth
+
+
+def fake_context(monkeypatch, forwarded=None, ip_address="10.0.0.5"):
+    headers = {"X-Forwarded-For": forwarded} if forwarded else {}
+    monkeypatch.setattr(auth, "st", SimpleNamespace(
+        context=SimpleNamespace(headers=headers, ip_address=ip_address)
+    ))
+
+
+def test_forwarded_header_ignored_without_trusted_proxies(monkeypatch):
+    fake_context(monkeypatch, forwarded="1.2.3.4")
+
+    assert auth.get_client_id() == "10.0.0.5"
+
+
+@pytest.mark.parametrize("forwarded, trusted_proxies, expected", [
+    ("203.0.113.7", 1, "203.0.113.7"),
+    # Spoofed entries are prepended by the client; the proxy's hop is last
+    ("6.6.6.6, 203.0.113.7", 1, "203.0.113.7"),
+    ("6.6.6.6, 203.0.113.7, 10.0.0.2", 2, "203.0.113.7"),
+])
+def test_forwarded_header_uses_trusted_hop(monkeypatch, forwarded, trusted_proxies, expected):
+    fake_context(monkeypatch, forwarded=forwarded)
+
+    assert auth.get_client_id(trusted_proxies) == expected
+
+
+def test_short_forwarded_header_falls_back_to_connection(monkeypatch):
+    fake_context(monkeypatch, forwarded="203.0.113.7")
+
+    assert auth.get_client_id(2) == "10.0.0.5"
+
+
+def test_rotating_spoofed_header_shares_one_bucket(monkeypatch):
+    service = auth.AuthService(auth.hash_key("secret"), trusted_proxies=1)
+    results = []
+    for i in range(auth.CLIENT_ATTEMPT_BURST + 1):
+        fake_context(monkeypatch, forwarded=f"6.6.6.{i}, 203.0.113.7")
+        results.append(service.verify("wrong", auth.get_client_id(service.trusted_proxies)))
+
+    assert all(not authenticated for authenticated, _ in results)
+    assert results[-1][1] > 0
+
+
+def test_missing_client_address_warns_once(monkeypatch, capsys):
+    fake_context(monkeypatch, ip_address=None)
+    monkeypatch.setattr(auth, "_warned_anonymous", False)
+
+    assert auth.get_client_id() == "anonymous"
+    assert auth.get_client_id() == "anonymous"
+
+    assert capsys.readouterr().out.count("share one login rate limit") == 1
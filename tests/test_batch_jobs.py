@@ -0,0 +1,61 @@
+# tests/test_batch_jobs.py
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+
+import utils.batch_jobs as batch_jobs
+
+
+def make_record(i):
+    return {
+        'name': f'Candidate {i}', 'phone': f'9{i:09d}', 'dob': date(1995, 3, 7), 'is_married': 'Single',
+        'father_name': 'Parent', 'husband_name': '', 'highest_qualification': '10th',
+        'education': {'10th': {'institution': 'State Board', 'year': 2010, 'specialization': ''}},
+        'work_experience': []
+    }
+
+
+@pytest.fixture
+def fake_dropbox(monkeypatch):
+    calls = SimpleNamespace(create_folders=[], uploads=[])
+
+    def create_folders(access_token, folder_paths):
+        calls.create_folders.append(set(folder_paths))
+        return True
+
+    def upload_file(local_file_path, access_token, folder, filename):
+        calls.uploads.append((folder, filename))
+        return SimpleNamespace(rev="rev-1")
+
+    monkeypatch.setattr(batch_jobs, "create_folders", create_folders)
+    monkeypatch.setattr(batch_jobs, "upload_file", upload_file)
+    return calls
+
+
+def test_shard_folders_are_created_once_per_chunk(tmp_path, monkeypatch, fake_dropbox):
+    monkeypatch.setattr(batch_jobs, "KEY_BATCH_SIZE", 20)
+    records = [make_record(i) for i in range(30)]
+
+    report = batch_jobs.run_batch(
+        records, str(tmp_path / "journal.db"), str(tmp_path / "out"),
+        access_token="token", folder_layout="date_hash"
+    )
+
+    assert report["processed"] == 30
+    assert len(fake_dropbox.uploads) == 30
+    # One bulk call per chunk, covering every folder that chunk uploads into
+    bulk_calls = [folders for folders in fake_dropbox.create_folders if len(folders) > 1]
+    assert len(bulk_calls) == 2
+    assert {folder for folder, _ in fake_dropbox.uploads} == set().union(*bulk_calls)
+
+
+def test_finished_records_are_skipped_on_resume(tmp_path, fake_dropbox):
+    records = [make_record(i) for i in range(3)]
+    journal_path = str(tmp_path / "journal.db")
+
+    batch_jobs.run_batch(records, journal_path, str(tmp_path / "out"), access_token="token")
+    report = batch_jobs.run_batch(records, journal_path, str(tmp_path / "out"), access_token="token")
+
+    assert report["skipped"] == 3
+    assert len(fake_dropbox.uploads) == 3
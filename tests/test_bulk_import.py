@@ -0,0 +1,121 @@
+# tests/test_bulk_import.py
+import csv
+from datetime import date, datetime
+
+import pytest
+
+from utils.bulk_import import iter_records
+
+HEADER = ["name", "phone", "dob", "is_married", "father_name", "highest_qualification",
+          "10th_institution", "10th_year", "company_1", "position_1", "start_date_1", "end_date_1"]
+
+
+def row(**overrides):
+    values = {
+        "name": "Asha Rao", "phone": "9876543210", "dob": "1990-05-12", "is_married": "single",
+        "father_name": "Parent", "highest_qualification": "10th",
+        "10th_institution": "State Board", "10th_year": "2006",
+        "company_1": "", "position_1": "", "start_date_1": "", "end_date_1": "",
+    }
+    values.update(overrides)
+    return values
+
+
+def write_csv(path, rows, header=HEADER):
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.DictWriter(file, fieldnames=header)
+        writer.writeheader()
+        writer.writerows(rows)
+    return str(path)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("1990-05-12", date(1990, 5, 12)),
+    ("2010-02-03", date(2010, 2, 3)),
+    ("1990-05-12 00:00:00", date(1990, 5, 12)),
+    ("12/05/1990", date(1990, 5, 12)),
+    ("03/02/2010", date(2010, 2, 3)),
+])
+def test_csv_dates(tmp_path, text, expected):
+    path = write_csv(tmp_path / "people.csv", [row(dob=text)])
+
+    [(row_number, record, errors)] = iter_records(path)
+
+    assert (row_number, errors) == (2, [])
+    assert record.dob == expected
+
+
+def test_explicit_date_format(tmp_path):
+    path = write_csv(tmp_path / "people.csv", [row(dob="05/12/1990")])
+
+    [(_, record, errors)] = iter_records(path, date_format="%m/%d/%Y")
+
+    assert errors == []
+    assert record.dob == date(1990, 5, 12)
+
+
+def test_bad_rows_are_reported_with_row_numbers(tmp_path):
+    path = write_csv(tmp_path / "people.csv", [
+        row(),
+        row(dob="not a date"),
+        row(dob=""),
+        row(name=""),
+        row(company_1="Acme", position_1="Clerk", start_date_1="2012-01-01"),
+    ])
+
+    results = list(iter_records(path))
+
+    assert [row_number for row_number, _, _ in results] == [2, 3, 4, 5, 6]
+    assert results[0][1] is not None
+    assert results[1][1] is None and results[1][2][0].startswith("Could not parse row")
+    assert results[2][2] == ["Missing date of birth"]
+    assert results[3][2] == ["Please fill in all required fields marked with *"]
+    assert results[4][2] == ["Missing dates for employer Acme"]
+
+
+def test_column_map(tmp_path):
+    header = ["Full Name" if column == "name" else "DOB" if column == "dob" else column
+              for column in HEADER]
+    source = row()
+    source["Full Name"], source["DOB"] = source.pop("name"), source.pop("dob")
+    path = write_csv(tmp_path / "people.csv", [source], header)
+
+    [(_, record, errors)] = iter_records(path, column_map={"Full Name": "name", "DOB": "dob"})
+
+    assert errors == []
+    assert (record.name, record.dob) == ("Asha Rao", date(1990, 5, 12))
+
+
+def test_xlsx_rows(tmp_path):
+    openpyxl = pytest.importorskip("openpyxl")
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(HEADER)
+    # Excel date cells arrive as datetimes, text cells are parsed like CSV
+    sheet.append([row()[column] for column in HEADER[:2]] + [datetime(1990, 5, 12)]
+                 + [row()[column] for column in HEADER[3:7]] + [2006, "Acme", "Clerk",
+                                                                 "2012-01-01", "01/02/2014"])
+    sheet.append([row()[column] for column in HEADER[:2]] + ["2010-02-03"]
+                 + [row()[column] for column in HEADER[3:7]] + [1970, None, None, None, None])
+    path = str(tmp_path / "people.xlsx")
+    workbook.save(path)
+
+    results = list(iter_records(path))
+
+    assert results[0][0] == 2 and results[0][2] == []
+    record = results[0][1]
+    assert record.dob == date(1990, 5, 12)
+    assert record.education[0].year == 2006
+    assert (record.work_experience[0].start_date, record.work_experience[0].end_date) == (
+        date(2012, 1, 1), date(2014, 2, 1)
+    )
+    assert results[1][0] == 3
+    assert results[1][2] == ["Invalid year of completion for 10th: 1970"]
+
+
+def test_unsupported_file_type(tmp_path):
+    path = tmp_path / "people.txt"
+    path.write_text("name\n")
+
+    with pytest.raises(ValueError, match="Unsupported file type"):
+        list(iter_records(str(path)))
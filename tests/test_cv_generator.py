@@ -0,0 +1,44 @@
+# tests/test_cv_generator.py
+from datetime import date
+
+from utils.cv_generator import generate_cv_pdf, pdf_content_hash
+
+USER_DATA = {
+    'name': 'Asha Rao', 'phone': '9876543210', 'dob': date(1995, 3, 7), 'is_married': 'Single',
+    'father_name': 'Parent', 'husband_name': '', 'highest_qualification': '12th',
+    'education': {
+        '10th': {'institution': 'State Board', 'year': 2010, 'specialization': ''},
+        '12th': {'institution': 'State Board', 'year': 2012, 'specialization': 'Science'},
+    },
+    'work_experience': [{
+        'company': 'Acme', 'position': 'Clerk', 'start_date': date(2016, 1, 4),
+        'end_date': date(2019, 6, 30), 'responsibilities': 'Accounts'
+    }]
+}
+
+
+def test_reproducible_pdf_is_byte_identical(tmp_path):
+    # The upload dedup index relies on this hash being stable
+    paths = [
+        generate_cv_pdf(USER_DATA, str(tmp_path / run), reproducible=True, generated_on=date(2026, 1, 5))
+        for run in ("a", "b")
+    ]
+
+    assert pdf_content_hash(paths[0]) == pdf_content_hash(paths[1])
+
+
+def test_reproducible_pdf_changes_with_content(tmp_path):
+    first = generate_cv_pdf(USER_DATA, str(tmp_path), reproducible=True, generated_on=date(2026, 1, 5))
+    second = generate_cv_pdf(dict(USER_DATA, phone="9876543211"), str(tmp_path),
+                             reproducible=True, generated_on=date(2026, 1, 5))
+
+    assert pdf_content_hash(first) != pdf_content_hash(second)
+
+
+def test_default_pdf_is_not_reproducible(tmp_path):
+    paths = [
+        generate_cv_pdf(USER_DATA, str(tmp_path / run), generated_on=date(2026, 1, 5))
+        for run in ("a", "b")
+    ]
+
+    assert pdf_content_hash(paths[0]) != pdf_content_hash(paths[1])
@@ -0,0 +1,39 @@
+# tests/test_data_collection.py
+from datetime import date
+
+import pytest
+
+from utils import data_collection
+from utils.data_collection import validate_user_data
+
+FORM_DATA = {
+    'name': 'Asha Rao', 'phone': '9876543210', 'dob': date(1995, 3, 7), 'is_married': 'Single',
+    'father_name': 'Parent', 'husband_name': '', 'highest_qualification': '10th',
+    'education': {'10th': {'institution': 'State Board', 'year': 2010, 'specialization': ''}},
+    'work_experience': []
+}
+
+
+@pytest.fixture
+def warnings(monkeypatch):
+    shown = []
+    monkeypatch.setattr(data_collection.st, "warning", shown.append)
+    return shown
+
+
+def test_valid_form_passes(warnings):
+    assert validate_user_data(FORM_DATA)
+    assert warnings == []
+
+
+@pytest.mark.parametrize("changes, message", [
+    ({'name': ''}, "Please fill in all required fields marked with *"),
+    ({'is_married': 'Married'}, "Please enter husband's name"),
+    ({'education': {}}, "Please fill in education details"),
+    # Rules that used to exist only in the bulk importer
+    ({'education': {'10th': {'institution': 'State Board', 'year': 1970}}},
+     "Invalid year of completion for 10th: 1970"),
+])
+def test_form_uses_record_rules(warnings, changes, message):
+    assert not validate_user_data(dict(FORM_DATA, **changes))
+    assert warnings == [message]
@@ -0,0 +1,70 @@
+# tests/test_encryption_policy.py
+import shutil
+from datetime import date
+
+import PyPDF2
+import pytest
+
+from utils.cv_generator import generate_cv_pdf
+from utils.encryption import encrypt_pdf
+from utils.encryption_policy import derive_document_key, derive_document_keys, load_policy
+
+USER_DATA = {
+    'name': 'Asha Rao', 'phone': '9876543210', 'dob': date(1995, 3, 7), 'is_married': 'Single',
+    'father_name': 'Parent', 'husband_name': '', 'highest_qualification': '10th',
+    'education': {'10th': {'institution': 'State Board', 'year': 2010, 'specialization': ''}},
+    'work_experience': []
+}
+
+
+@pytest.fixture(scope="module")
+def plain_pdf(tmp_path_factory):
+    return generate_cv_pdf(USER_DATA, output_dir=str(tmp_path_factory.mktemp("pdf")))
+
+
+@pytest.mark.parametrize("config, password", [
+    ({}, "07031995"),
+    ({"cipher": "rc4_40"}, "07031995"),
+    ({"password_source": "phone"}, "9876543210"),
+    ({"password_source": "dob_phone", "owner_password_source": "random", "permissions": ["print"]},
+     "070319953210"),
+])
+def test_encrypted_pdf_opens_with_policy_password(tmp_path, plain_pdf, config, password):
+    policy = load_policy(config)
+    source = tmp_path / "cv.pdf"
+    shutil.copy(plain_pdf, source)
+
+    document_key = derive_document_key(policy, USER_DATA)
+    reader = PyPDF2.PdfReader(encrypt_pdf(str(source), document_key=document_key))
+
+    assert document_key.user_password == password
+    assert reader.decrypt("wrong") == 0
+    assert reader.decrypt(password)
+    assert reader.trailer["/Encrypt"]["/P"] == policy.permissions_flag()
+
+
+def test_invalid_policy_is_rejected():
+    with pytest.raises(ValueError, match="Unsupported cipher"):
+        load_policy({"cipher": "aes256"})
+    with pytest.raises(ValueError, match="owner_password"):
+        load_policy({"owner_password_source": "fixed"})
+
+
+def test_parallel_derivation_matches_records():
+    records = [dict(USER_DATA, phone=f"90000{i:05d}") for i in range(100)]
+    policy = load_policy({"password_source": "phone"})
+
+    document_keys = derive_document_keys(policy, records, max_workers=2)
+
+    assert [key.user_password for key in document_keys] == [record['phone'] for record in records]
+
+
+def test_fingerprint_changes_with_encryption_settings():
+    base = load_policy({})
+
+    assert load_policy({}).fingerprint() == base.fingerprint()
+    assert load_policy({"permissions": list(reversed(base.permissions))}).fingerprint() == base.fingerprint()
+    for config in ({"password_source": "phone"}, {"cipher": "rc4_40"}, {"permissions": ["print"]},
+                   {"owner_password_source": "random"},
+                   {"owner_password_source": "fixed", "owner_password": "admin"}):
+        assert load_policy(config).fingerprint() != base.fingerprint()
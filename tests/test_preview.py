@@ -0,0 +1,109 @@
+# tests/test_preview.py
+from datetime import date
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+import utils.preview as preview
+
+FORM_DATA = {
+    'name': 'Asha Rao', 'phone': '9876543210', 'dob': date(1995, 3, 7), 'is_married': 'Single',
+    'father_name': 'Parent', 'husband_name': '', 'highest_qualification': '10th',
+    'education': {'10th': {'institution': 'State Board', 'year': 2010, 'specialization': ''}},
+    'work_experience': []
+}
+
+
+def _app():
+    import streamlit as st
+    from utils.preview import show_preview
+
+    show_preview(st.session_state.form)
+
+
+@pytest.fixture
+def renders(monkeypatch):
+    rendered = []
+    monkeypatch.setattr(preview, "render_preview_png", lambda user_data: (
+        rendered.append(user_data['name']) or b"png:" + user_data['name'].encode()
+    ))
+    polls = []
+    pending_preview = preview._pending_preview
+    monkeypatch.setattr(preview, "_pending_preview", lambda: polls.append(1) or pending_preview())
+    preview._cached_preview.clear()
+    return rendered, polls
+
+
+def _edit(at, **changes):
+    at.session_state["form"] = dict(FORM_DATA, **changes)
+    at.run()
+
+
+def _settle(at):
+    at.session_state["preview_changed_at"] -= preview.PREVIEW_DEBOUNCE
+    at.run()
+
+
+def test_first_preview_is_rendered_at_once_and_not_polled(renders):
+    rendered, polls = renders
+    at = AppTest.from_function(_app)
+    _edit(at)
+
+    assert rendered == ["Asha Rao"]
+    assert at.session_state["preview_image"] == b"png:Asha Rao"
+    # Up to date: shown statically, no polling fragment
+    assert polls == []
+
+
+def test_edits_are_debounced(renders):
+    rendered, polls = renders
+    at = AppTest.from_function(_app)
+    _edit(at)
+
+    _edit(at, name="Asha R")
+    _edit(at, name="Asha Ra")
+    assert rendered == ["Asha Rao"]
+    assert at.session_state["preview_image"] == b"png:Asha Rao"
+    assert len(polls) == 2
+
+    # Once the form has settled only the last edit is rendered, and polling stops
+    _settle(at)
+    assert rendered == ["Asha Rao", "Asha Ra"]
+    assert at.session_state["preview_image"] == b"png:Asha Ra"
+    polled = len(polls)
+    at.run()
+    assert len(polls) == polled
+
+
+def test_previews_are_cached_by_form_state(renders):
+    rendered, _ = renders
+    at = AppTest.from_function(_app)
+    _edit(at)
+    _edit(at, name="Asha R")
+    _settle(at)
+
+    _edit(at)
+    _settle(at)
+
+    assert rendered == ["Asha Rao", "Asha R"]
+    assert at.session_state["preview_image"] == b"png:Asha Rao"
+
+
+def test_preview_renders_only_the_first_page(monkeypatch):
+    pymupdf = pytest.importorskip("pymupdf")
+    long_cv = dict(FORM_DATA, work_experience=[{
+        'company': f'Company {i}', 'position': 'Clerk', 'start_date': date(2010, 1, 1),
+        'end_date': date(2011, 1, 1), 'responsibilities': 'Kept the ledgers. ' * 100
+    } for i in range(10)])
+    documents = []
+    build_cv_document = preview.build_cv_document
+
+    def capture(target, model, **kwargs):
+        build_cv_document(target, model, **kwargs)
+        documents.append(target.getvalue())
+
+    monkeypatch.setattr(preview, "build_cv_document", capture)
+
+    assert preview.render_preview_png(long_cv).startswith(b"\x89PNG")
+    with pymupdf.open(stream=documents[0], filetype="pdf") as document:
+        assert document.page_count == 1
@@ -0,0 +1,225 @@
+# tests/test_rate_limiter.py
+import time
+from types import SimpleNamespace
+
+import pytest
+from dropbox.exceptions import RateLimitError
+
+import utils.dropbox_handler as dropbox_handler
+from utils.rate_limiter import AdaptiveLimiter, RateLimited, TokenBucket
+
+
+class ScheduledThrottleFake:
+    """
+    Fake server call that throttles on a schedule
+
+    Each entry of the schedule is used for one call: None succeeds, a number
+    raises a 429 with that Retry-After (0 for none). Once the schedule is
+    used up every call succeeds, or keeps throttling if repeat_last is set.
+    """
+
+    def __init__(self, schedule, make_error=RateLimited, repeat_last=False):
+        self.schedule = list(schedule)
+        self.make_error = make_error
+        self.repeat_last = repeat_last
+        self.calls = 0
+
+    def __call__(self, *args, **kwargs):
+        self.calls += 1
+        if self.schedule:
+            retry_after = self.schedule[0] if self.repeat_last and len(self.schedule) == 1 else self.schedule.pop(0)
+            if retry_after is not None:
+                raise self.make_error(retry_after)
+        return "ok"
+
+
+def dropbox_rate_limit_error(retry_after):
+    return RateLimitError("request-id", backoff=retry_after or None)
+
+
+class FakeDropbox:
+    """Stands in for dropbox.Dropbox; files_upload throttles on a schedule"""
+
+    def __init__(self, schedule):
+        self.throttle = ScheduledThrottleFake(schedule, make_error=dropbox_rate_limit_error)
+
+    def files_upload(self, data, path, **kwargs):
+        self.throttle()
+        return SimpleNamespace(path=path, size=len(data))
+
+
+def test_limit_halves_on_throttle():
+    limiter = AdaptiveLimiter(initial_limit=8, default_retry_after=0.01)
+    fake = ScheduledThrottleFake([0.01])
+
+    assert limiter.call(fake) == "ok"
+
+    metrics = limiter.metrics()
+    assert fake.calls == 2
+    assert metrics["throttled"] == 1
+    # Halved to 4, then the successful retry adds 1/4
+    assert metrics["concurrency_limit"] == 4
+
+
+def test_limit_grows_by_one_per_window_of_successes():
+    limiter = AdaptiveLimiter(initial_limit=4, max_limit=32)
+    fake = ScheduledThrottleFake([])
+
+    # +1/limit per success, so about +1 per limit's worth of successes
+    for _ in range(4):
+        limiter.call(fake)
+    assert limiter.limit == pytest.approx(5, abs=0.2)
+
+    for _ in range(5):
+        limiter.call(fake)
+    assert limiter.limit == pytest.approx(6, abs=0.2)
+
+
+def test_limit_respects_bounds():
+    limiter = AdaptiveLimiter(initial_limit=2, min_limit=1, max_limit=3, default_retry_after=0.001)
+
+    limiter.call(ScheduledThrottleFake([0.001, 0.001, 0.001]))
+    assert limiter.limit >= 1
+
+    for _ in range(50):
+        limiter.call(ScheduledThrottleFake([]))
+    assert limiter.metrics()["concurrency_limit"] == 3
+
+
+def test_retry_after_pauses_new_calls():
+    limiter = AdaptiveLimiter(initial_limit=4)
+
+    limiter.acquire()
+    limiter.release(throttled=True, retry_after=0.3)
+    assert 0.2 < limiter.metrics()["paused_for_seconds"] <= 0.3
+
+    started = time.monotonic()
+    limiter.acquire()
+    limiter.release()
+    assert time.monotonic() - started >= 0.25
+
+
+def test_call_waits_for_retry_after_before_retrying():
+    limiter = AdaptiveLimiter(initial_limit=4)
+    fake = ScheduledThrottleFake([0.2])
+
+    started = time.monotonic()
+    assert limiter.call(fake) == "ok"
+    assert time.monotonic() - started >= 0.2
+    assert fake.calls == 2
+
+
+def test_default_pause_when_no_retry_after():
+    limiter = AdaptiveLimiter(initial_limit=4, default_retry_after=0.15)
+
+    started = time.monotonic()
+    limiter.call(ScheduledThrottleFake([0]))
+    assert time.monotonic() - started >= 0.15
+
+
+def test_gives_up_after_max_retries():
+    limiter = AdaptiveLimiter(initial_limit=4, max_retries=2)
+    fake = ScheduledThrottleFake([0.001], repeat_last=True)
+
+    with pytest.raises(RateLimited):
+        limiter.call(fake)
+    assert fake.calls == 3
+    assert limiter.metrics()["throttled"] == 3
+    assert limiter.metrics()["in_flight"] == 0
+
+
+def test_other_errors_are_not_retried():
+    limiter = AdaptiveLimiter(initial_limit=4)
+    calls = []
+
+    def broken():
+        calls.append(1)
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        limiter.call(broken)
+    assert len(calls) == 1
+    metrics = limiter.metrics()
+    assert metrics["failures"] == 1
+    assert metrics["concurrency_limit"] == 4
+
+
+def test_dropbox_upload_retries_on_rate_limit_error(tmp_path, monkeypatch):
+    fake_client = FakeDropbox([0.05])
+    monkeypatch.setattr(dropbox_handler, "_client", lambda access_token: fake_client)
+    monkeypatch.setattr(dropbox_handler, "_limiters", {"token": AdaptiveLimiter(
+        initial_limit=8, retry_after_for=dropbox_handler._retry_after_for
+    )})
+    local_file = tmp_path / "cv.pdf"
+    local_file.write_bytes(b"%PDF-1.4 test")
+
+    started = time.monotonic()
+    metadata = dropbox_handler.upload_file(str(local_file), "token", "CVs", "cv.pdf")
+
+    assert metadata.path == "/CVs/cv.pdf"
+    assert fake_client.throttle.calls == 2
+    assert time.monotonic() - started >= 0.05
+    metrics = dropbox_handler.get_limiter_metrics("token")
+    assert metrics["throttled"] == 1
+    assert metrics["concurrency_limit"] == 4
+
+
+def test_dropbox_limiter_is_per_access_token(tmp_path, monkeypatch):
+    clients = {"throttled": FakeDropbox([0.01]), "other": FakeDropbox([])}
+    monkeypatch.setattr(dropbox_handler, "_client", lambda access_token: clients[access_token])
+    monkeypatch.setattr(dropbox_handler, "_limiters", {})
+    local_file = tmp_path / "cv.pdf"
+    local_file.write_bytes(b"%PDF-1.4 test")
+
+    assert dropbox_handler.upload_file(str(local_file), "throttled", "CVs", "cv.pdf")
+    assert dropbox_handler.upload_file(str(local_file), "other", "CVs", "cv.pdf")
+
+    throttled = dropbox_handler.get_limiter_metrics("throttled")
+    other = dropbox_handler.get_limiter_metrics("other")
+    assert throttled["throttled"] == 1
+    assert throttled["concurrency_limit"] < other["concurrency_limit"]
+    assert other["throttled"] == 0
+    assert other["paused_for_seconds"] == 0
+    # Every function using the same token shares its limiter
+    assert dropbox_handler._limiter_for("throttled") is dropbox_handler._limiter_for("throttled")
+
+
+def test_token_bucket_limits_and_refills(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    bucket = TokenBucket(rate=1.0, capacity=2)
+
+    assert bucket.consume("a") == (True, 0.0)
+    assert bucket.consume("a") == (True, 0.0)
+    allowed, retry_after = bucket.consume("a")
+    assert not allowed
+    assert retry_after == pytest.approx(1.0)
+
+    now[0] += 1.0
+    assert bucket.consume("a")[0]
+
+
+@pytest.mark.parametrize("use_db", [False, True])
+def test_token_bucket_evicts_refilled_buckets(monkeypatch, tmp_path, use_db):
+    now = [1000.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    bucket = TokenBucket(rate=0.5, capacity=5, db_path=str(tmp_path / "limits.db") if use_db else None)
+
+    for i in range(100):
+        bucket.consume(f"spoofed-{i}")
+    assert len(bucket) == 100
+
+    # After a full refill period the old buckets are indistinguishable from new ones
+    now[0] += bucket.refill_seconds + 1
+    bucket.consume("fresh")
+    assert len(bucket) == 1
+
+
+def test_token_bucket_caps_memory():
+    bucket = TokenBucket(rate=0.1, capacity=5, max_buckets=10)
+
+    for i in range(50):
+        bucket.consume(f"client-{i}")
+    assert len(bucket) == 10
+    # The most recent clients keep their buckets
+    assert "client-49" in bucket._buckets
@@ -0,0 +1,83 @@
+# tests/test_records.py
+from datetime import date
+
+import pytest
+
+from utils.records import (Education, Person, WorkExperience, from_json, from_user_data, pack,
+                           to_json, unpack)
+
+
+def make_person(**overrides):
+    values = dict(
+        name="Asha Rao",
+        phone="9876543210",
+        dob=date(1995, 3, 7),
+        is_married="Married",
+        father_name="Parent",
+        husband_name="Spouse",
+        highest_qualification="UG (Bachelor's)",
+        education=[
+            Education("10th", "State Board", 2010),
+            Education("12th", "State Board", 2012, "Science"),
+            Education("UG (Bachelor's)", "City College — Pune", 2015, "B.Com"),
+        ],
+        work_experience=[
+            WorkExperience("Acme", "Clerk", date(2016, 1, 4), date(2019, 6, 30), "Accounts, filing"),
+        ],
+    )
+    values.update(overrides)
+    return Person(**values)
+
+
+@pytest.mark.parametrize("dump, load", [(pack, unpack), (to_json, from_json)])
+def test_round_trip(dump, load):
+    person = make_person()
+
+    assert load(dump(person)) == person
+
+
+@pytest.mark.parametrize("dump, load", [(pack, unpack), (to_json, from_json)])
+def test_round_trip_large_field(dump, load):
+    # Longer than the 64 KB a 16-bit length prefix can describe
+    responsibilities = "Handled ledgers ✓ " * 10000
+    person = make_person(work_experience=[
+        WorkExperience("Acme", "Clerk", date(2016, 1, 4), date(2019, 6, 30), responsibilities),
+    ])
+
+    assert len(responsibilities.encode()) > 65535
+    assert load(dump(person)) == person
+
+
+def test_round_trip_without_optional_sections():
+    person = make_person(is_married="Single", husband_name="", work_experience=[])
+
+    assert unpack(pack(person)) == person
+
+
+def test_unpack_rejects_unknown_version():
+    packed = bytearray(pack(make_person()))
+    packed[0] = 1
+
+    with pytest.raises(ValueError, match="version"):
+        unpack(bytes(packed))
+
+
+def test_user_data_round_trip():
+    person = make_person()
+
+    assert from_user_data(person.to_user_data()) == person
+
+
+def test_validate_reports_bad_fields():
+    person = make_person(
+        is_married="Divorced",
+        education=[Education("UG (Bachelor's)", "", 1970)],
+    )
+
+    errors = person.validate()
+
+    assert "Invalid marital status: Divorced" in errors
+    assert "Missing institution for UG (Bachelor's)" in errors
+    assert "Invalid year of completion for UG (Bachelor's): 1970" in errors
+    with pytest.raises(ValueError):
+        from_user_data(person.to_user_data())
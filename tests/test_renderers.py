@@ -0,0 +1,70 @@
+# tests/test_renderers.py
+from datetime import date
+
+import pytest
+
+from utils import renderers
+from utils.cv_generator import pdf_content_hash
+from utils.renderers import RENDERERS, render_formats
+
+USER_DATA = {
+    'name': 'Asha <script>alert(1)</script> & Co', 'phone': '9876543210', 'dob': date(1995, 3, 7),
+    'is_married': 'Single', 'father_name': 'Parent "P"', 'husband_name': '',
+    'highest_qualification': '10th',
+    'education': {'10th': {'institution': 'Board <b>', 'year': 2010, 'specialization': ''}},
+    'work_experience': [{
+        'company': 'Acme & Sons', 'position': 'Clerk', 'start_date': date(2016, 1, 4),
+        'end_date': date(2019, 6, 30), 'responsibilities': 'Ledgers <i>and</i> filing'
+    }]
+}
+
+
+def test_html_escapes_user_input(tmp_path):
+    outputs = render_formats(USER_DATA, str(tmp_path), formats=["html"], generated_on=date(2026, 1, 5))
+
+    page = open(outputs["html"], encoding="utf-8").read()
+    assert "<script>" not in page
+    assert "&lt;script&gt;alert(1)&lt;/script&gt;" in page
+    assert "Acme &amp; Sons" in page
+    assert "Parent &quot;P&quot;" in page
+    assert "Board &lt;b&gt;" in page
+    assert "Ledgers &lt;i&gt;and&lt;/i&gt; filing" in page
+
+
+def test_docx_contains_cv_sections(tmp_path):
+    docx = pytest.importorskip("docx")
+    outputs = render_formats(USER_DATA, str(tmp_path), formats=["docx"], generated_on=date(2026, 1, 5))
+
+    document = docx.Document(outputs["docx"])
+    text = "\n".join(paragraph.text for paragraph in document.paragraphs)
+    assert USER_DATA['name'].upper() in text
+    assert "Clerk at Acme & Sons" in text
+    assert "Ledgers <i>and</i> filing" in text
+    personal, education = document.tables
+    assert 'Parent "P"' in [row.cells[1].text for row in personal.rows]
+    assert "Board <b>" in [cell.text for cell in education.rows[1].cells]
+
+
+def test_options_reach_every_renderer(tmp_path, monkeypatch):
+    received = {}
+
+    def render_txt(model, output_path, **options):
+        received.update(options)
+        with open(output_path, "w") as file:
+            file.write(model.name)
+        return output_path
+
+    monkeypatch.setitem(RENDERERS, "txt", render_txt)
+    outputs = render_formats(USER_DATA, str(tmp_path), formats=["pdf", "html", "txt"],
+                             generated_on=date(2026, 1, 5), reproducible=True)
+
+    assert received == {"reproducible": True}
+    assert set(outputs) == {"pdf", "html", "txt"}
+    again = render_formats(USER_DATA, str(tmp_path / "again"), formats=["pdf"],
+                           generated_on=date(2026, 1, 5), reproducible=True)
+    assert pdf_content_hash(outputs["pdf"]) == pdf_content_hash(again["pdf"])
+
+
+def test_unknown_format_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match="Unsupported output formats: odt"):
+        render_formats(USER_DATA, str(tmp_path), formats=["pdf", "odt"])
@@ -0,0 +1,81 @@
+# tests/test_scratch.py
+import os
+import time
+
+import pytest
+
+import utils.scratch as scratch
+from utils.scratch import ScratchQuotaExceeded, check_scratch_quota, reap_orphans, scratch_dir
+
+
+@pytest.fixture
+def root(tmp_path, monkeypatch):
+    monkeypatch.setattr(scratch, "get_scratch_root", lambda: str(tmp_path))
+    monkeypatch.setattr(scratch, "_usage", {})
+    return tmp_path
+
+
+def test_scratch_dir_removed_on_exception(root):
+    with pytest.raises(RuntimeError):
+        with scratch_dir() as path:
+            (root / os.path.basename(path) / "cv.pdf").write_bytes(b"data")
+            raise RuntimeError("render failed")
+
+    assert not os.path.exists(path)
+    assert scratch.scratch_usage() == 0
+
+
+def test_reap_orphans_only_removes_old_scratch_dirs(root):
+    old = root / "req_old"
+    new = root / "req_new"
+    other = root / "not_scratch"
+    for path in (old, new, other):
+        path.mkdir()
+    an_hour_ago = time.time() - 3600
+    os.utime(old, (an_hour_ago, an_hour_ago))
+    os.utime(other, (an_hour_ago, an_hour_ago))
+
+    assert reap_orphans(str(root), max_age=60) == 1
+    assert not old.exists()
+    assert new.exists() and other.exists()
+
+
+def test_quota_checked_after_writes(root):
+    with scratch_dir(quota=100) as path:
+        with open(os.path.join(path, "cv.pdf"), "wb") as file:
+            file.write(b"x" * 60)
+        check_scratch_quota(path, quota=100)
+        assert scratch.scratch_usage() == 60
+
+        with open(os.path.join(path, "cv.docx"), "wb") as file:
+            file.write(b"x" * 60)
+        with pytest.raises(ScratchQuotaExceeded):
+            check_scratch_quota(path, quota=100)
+
+    assert scratch.scratch_usage() == 0
+
+
+def test_new_scratch_dirs_refused_when_quota_used(root):
+    with scratch_dir(quota=100) as path:
+        with open(os.path.join(path, "cv.pdf"), "wb") as file:
+            file.write(b"x" * 100)
+        check_scratch_quota(path, quota=200)
+
+        with pytest.raises(ScratchQuotaExceeded):
+            with scratch_dir(quota=100):
+                pass
+
+    with scratch_dir(quota=100):
+        pass
+
+
+def test_janitor_runs_tasks_from_every_call(root, monkeypatch):
+    monkeypatch.setattr(scratch, "_janitor_tasks", [])
+    calls = []
+    first, second = (lambda: calls.append("first")), (lambda: calls.append("second"))
+
+    scratch.start_janitor(interval=3600, tasks=[first])
+    scratch.start_janitor(interval=3600, tasks=[first, second])
+    scratch._sweep(max_age=3600)
+
+    assert calls == ["first", "second"]
@@ -0,0 +1,131 @@
+# tests/test_session_store.py
+import hashlib
+import sqlite3
+import time
+from datetime import date
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from utils.auth import get_session_secret, hash_key, issue_session_token, SESSION_QUERY_PARAM
+from utils.session_store import SessionStore, SQLiteSessionStore
+
+SESSION_SECRET = "test-session-secret"
+
+
+def test_save_load_exists_delete(tmp_path):
+    store = SQLiteSessionStore(str(tmp_path / "sessions.db"))
+    user_data = {
+        'name': 'Asha Rao', 'phone': '9876543210', 'dob': date(1995, 3, 7), 'is_married': 'Single',
+        'father_name': 'R', 'husband_name': '', 'highest_qualification': '10th',
+        'education': {'10th': {'institution': 'State Board', 'year': 2010, 'specialization': ''}},
+        'work_experience': []
+    }
+
+    store.save("sid", {'step': 2, 'user_data': user_data})
+    assert store.exists("sid")
+    assert store.load("sid") == {'step': 2, 'user_data': user_data}
+
+    store.delete("sid")
+    assert not store.exists("sid")
+    assert store.load("sid") is None
+
+
+def test_state_encoding_round_trip():
+    state = {'step': 2, 'user_data': {
+        'name': 'Asha Rao', 'phone': '9876543210', 'dob': date(1995, 3, 7), 'is_married': 'Single',
+        'father_name': 'R', 'husband_name': '', 'highest_qualification': '10th',
+        'education': {'10th': {'institution': 'State Board', 'year': 2010, 'specialization': ''}},
+        'work_experience': []
+    }}
+
+    assert SessionStore.decode_state(SessionStore.encode_state(state)) == state
+    assert SessionStore.decode_state(SessionStore.encode_state({'step': 1})) == {'step': 1, 'user_data': {}}
+
+
+def test_purge_expired(tmp_path):
+    store = SQLiteSessionStore(str(tmp_path / "sessions.db"), ttl=0.05)
+    store.save("old", {'step': 1})
+    time.sleep(0.1)
+    store.ttl = 60
+    store.save("new", {'step': 1})
+
+    assert store.purge_expired() == 1
+    assert store.exists("new")
+
+
+def test_connections_are_closed(tmp_path, monkeypatch):
+    opened = []
+    connect = sqlite3.connect
+
+    def tracking_connect(*args, **kwargs):
+        conn = connect(*args, **kwargs)
+        opened.append(conn)
+        return conn
+
+    monkeypatch.setattr(sqlite3, "connect", tracking_connect)
+    store = SQLiteSessionStore(str(tmp_path / "sessions.db"))
+    store.save("sid", {'step': 1})
+    store.load("sid")
+    store.purge_expired()
+
+    for conn in opened:
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+
+
+def _auth_app(store_path, auth_config=None):
+    def app(store_path):
+        import streamlit as st
+        from utils.auth import check_authentication
+        from utils.session_store import SessionStore, SQLiteSessionStore
+
+        st.write("in" if check_authentication(SQLiteSessionStore(store_path)) else "out")
+
+    # The signing key is cached per process; each test brings its own secrets
+    get_session_secret.clear()
+    at = AppTest.from_function(app, args=(store_path,))
+    at.secrets["auth"] = auth_config or {"access_key_hash": "unused", "session_secret": SESSION_SECRET}
+    return at
+
+
+def test_session_token_is_revoked_by_logout(tmp_path):
+    store_path = str(tmp_path / "sessions.db")
+    store = SQLiteSessionStore(store_path)
+    store.save("sid", {'step': 1})
+    token = issue_session_token("sid", SESSION_SECRET.encode())
+
+    at = _auth_app(store_path)
+    at.query_params[SESSION_QUERY_PARAM] = token
+    at.run()
+    assert at.markdown[-1].value == "in"
+
+    # Logging out deletes the session; a copied URL no longer works
+    store.delete("sid")
+    at = _auth_app(store_path)
+    at.query_params[SESSION_QUERY_PARAM] = token
+    at.run()
+    assert at.markdown[-1].value == "out"
+
+
+def test_no_session_tokens_without_session_secret(tmp_path):
+    store_path = str(tmp_path / "sessions.db")
+    SQLiteSessionStore(store_path).save("sid", {'step': 1})
+    access_key_hash = hash_key("secret")
+    auth_config = {"access_key_hash": access_key_hash}
+
+    # A token signed with a key derived from the access key hash is not accepted
+    derived = hashlib.sha256(f"session:{access_key_hash}".encode()).digest()
+    at = _auth_app(store_path, auth_config)
+    at.query_params[SESSION_QUERY_PARAM] = issue_session_token("sid", derived)
+    at.run()
+    assert at.markdown[-1].value == "out"
+
+    # Logging in works, but no token is put in the URL
+    at = _auth_app(store_path, auth_config)
+    at.run()
+    at.text_input[0].input("secret")
+    at.button[0].click()
+    at.run()
+    assert at.session_state["authenticated"]
+    assert SESSION_QUERY_PARAM not in at.query_params
@@ -0,0 +1,76 @@
+# tests/test_storage.py
+import io
+
+import pytest
+
+from utils.dropbox_handler import DropboxStorage
+from utils.storage import DedupStorage, LocalStorage
+
+
+def test_local_storage_writes_under_root(tmp_path):
+    storage = LocalStorage(str(tmp_path))
+
+    assert storage.put_fileobj(io.BytesIO(b"data"), "/CVs/2026", "cv.pdf")
+    assert (tmp_path / "CVs" / "2026" / "cv.pdf").read_bytes() == b"data"
+
+
+@pytest.mark.parametrize("folder, filename", [
+    ("/CVs", "../../../escaped.pdf"),
+    ("../outside", "cv.pdf"),
+    ("/CVs", "/etc/escaped.pdf"),
+    ("/", ""),
+])
+def test_local_storage_rejects_paths_outside_root(tmp_path, folder, filename):
+    root = tmp_path / "root"
+    storage = LocalStorage(str(root))
+
+    with pytest.raises(ValueError):
+        storage._path(folder, filename)
+    assert not storage.put_fileobj(io.BytesIO(b"data"), folder, filename)
+    assert not (tmp_path / "escaped.pdf").exists()
+
+
+def test_local_storage_rejects_symlink_escape(tmp_path):
+    root = tmp_path / "root"
+    root.mkdir()
+    (root / "link").symlink_to(tmp_path)
+    storage = LocalStorage(str(root))
+
+    assert not storage.put_fileobj(io.BytesIO(b"data"), "/link", "escaped.pdf")
+    assert not (tmp_path / "escaped.pdf").exists()
+
+
+def test_dedup_skips_unchanged_upload(tmp_path):
+    index = str(tmp_path / "index.db")
+    source = tmp_path / "cv.pdf"
+    source.write_bytes(b"first")
+    storage = DedupStorage(LocalStorage(str(tmp_path / "root")), index)
+
+    assert storage.put_file(str(source), "/CVs", "x.pdf", content_hash="h1")
+    (tmp_path / "root" / "CVs" / "x.pdf").unlink()
+    # Same hash at the same destination: skipped
+    assert storage.put_file(str(source), "/CVs", "x.pdf", content_hash="h1")
+    assert not (tmp_path / "root" / "CVs" / "x.pdf").exists()
+    # New content is uploaded
+    assert storage.put_file(str(source), "/CVs", "x.pdf", content_hash="h2")
+    assert (tmp_path / "root" / "CVs" / "x.pdf").exists()
+
+
+def test_dedup_index_is_per_destination(tmp_path):
+    index = str(tmp_path / "index.db")
+    source = tmp_path / "cv.pdf"
+    source.write_bytes(b"data")
+
+    assert DedupStorage(LocalStorage(str(tmp_path / "rootA")), index).put_file(
+        str(source), "/CVs", "x.pdf", content_hash="h"
+    )
+    assert DedupStorage(LocalStorage(str(tmp_path / "rootB")), index).put_file(
+        str(source), "/CVs", "x.pdf", content_hash="h"
+    )
+    assert (tmp_path / "rootB" / "CVs" / "x.pdf").read_bytes() == b"data"
+
+
+def test_backend_identities_differ_by_destination():
+    assert DropboxStorage("token-a").identity != DropboxStorage("token-b").identity
+    assert "token-a" not in DropboxStorage("token-a").identity
+    assert LocalStorage("/rootA").identity != LocalStorage("/rootB").identity
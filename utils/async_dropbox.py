@@ -0,0 +1,304 @@
+# utils/async_dropbox.py
+import asyncio
+import json
+import os
+import httpx
+from utils.rate_limiter import AsyncAdaptiveLimiter, RateLimited
+
+API_URL = "https://api.dropboxapi.com/2"
+CONTENT_URL = "https://content.dropboxapi.com/2"
+
+# files/upload accepts at most 150MB; larger files go through an upload session
+SIMPLE_UPLOAD_LIMIT = 150 * 1024 * 1024  # 150MB
+CHUNK_SIZE = 4 * 1024 * 1024  # 4MB
+
+
+class DropboxHTTPError(Exception):
+    """Non-2xx response from the Dropbox HTTP API"""
+
+    def __init__(self, status_code, error_summary):
+        super().__init__(f"Dropbox API error {status_code}: {error_summary}")
+        self.status_code = status_code
+        self.error_summary = error_summary
+
+
+def _read_file(path):
+    with open(path, 'rb') as file:
+        return file.read()
+
+
+def _normalize_path(path):
+    if path and not path.startswith('/'):
+        path = '/' + path
+    return path
+
+
+class AsyncDropboxClient:
+    """
+    Asyncio Dropbox client over a pooled HTTP connection
+
+    Mirrors the functions in utils/dropbox_handler.py (same arguments and
+    return values) so thousands of operations can run on one event loop.
+    Use as an async context manager so the connection pool is closed.
+    """
+
+    def __init__(self, access_token, max_connections=100, limiter=None,
+                 api_url=API_URL, content_url=CONTENT_URL, transport=None):
+        """
+        Args:
+            access_token (str): Dropbox access token
+            max_connections (int): Size of the HTTP connection pool
+            limiter (AsyncAdaptiveLimiter): Concurrency limiter, a new one if None
+            api_url (str): Base URL of the RPC endpoints (override for a local fake)
+            content_url (str): Base URL of the content endpoints
+            transport (httpx.AsyncBaseTransport): Custom transport, e.g. for tests
+        """
+
+        self.api_url = api_url
+        self.content_url = content_url
+        # Bounds files open (and file bodies in memory) at once, however many
+        # uploads are awaited together
+        self.file_slots = asyncio.Semaphore(max_connections)
+        self.limiter = limiter or AsyncAdaptiveLimiter(
+            initial_limit=min(16, max_connections), max_limit=max_connections
+        )
+        self.client = httpx.AsyncClient(
+            headers={"Authorization": f"Bearer {access_token}"},
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            timeout=httpx.Timeout(60.0),
+            transport=transport
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        await self.client.aclose()
+
+    async def _send(self, url, **kwargs):
+        response = await self.client.post(url, **kwargs)
+        if response.status_code == 429:
+            retry_after = response.headers.get("Retry-After")
+            raise RateLimited(float(retry_after) if retry_after else None)
+        if response.status_code >= 400:
+            try:
+                error_summary = response.json().get("error_summary", response.text)
+            except ValueError:
+                error_summary = response.text
+            raise DropboxHTTPError(response.status_code, error_summary)
+        return response
+
+    async def _rpc(self, endpoint, arguments):
+        response = await self.limiter.call(self._send, f"{self.api_url}/{endpoint}", json=arguments)
+        return response.json()
+
+    async def _content(self, endpoint, arguments, data):
+        response = await self.limiter.call(
+            self._send,
+            f"{self.content_url}/{endpoint}",
+            headers={
+                "Dropbox-API-Arg": json.dumps(arguments),
+                "Content-Type": "application/octet-stream"
+            },
+            content=data
+        )
+        return response.json()
+
+    async def test_connection(self):
+        """
+        Test the connection and access token
+
+        Returns:
+            bool: True if connection successful, False otherwise
+        """
+
+        try:
+            await self.limiter.call(self._send, f"{self.api_url}/users/get_current_account")
+            return True
+        except Exception:
+            return False
+
+    async def upload_file(self, local_file_path, dropbox_folder, filename):
+        """
+        Upload a file to Dropbox and return its metadata
+
+        Args:
+            local_file_path (str): Path to the local file
+            dropbox_folder (str): Dropbox folder path
+            filename (str): Name for the file in Dropbox
+
+        Returns:
+            dict: File metadata (including rev), None if error
+        """
+
+        try:
+            dropbox_path = _normalize_path(dropbox_folder).rstrip('/') + '/' + filename
+            commit = {"path": dropbox_path, "mode": "overwrite", "autorename": True}
+
+            async with self.file_slots:
+                file_size = os.path.getsize(local_file_path)
+                if file_size <= SIMPLE_UPLOAD_LIMIT:
+                    data = await asyncio.to_thread(_read_file, local_file_path)
+                    return await self._content("files/upload", commit, data)
+
+                file = await asyncio.to_thread(open, local_file_path, 'rb')
+                try:
+                    return await self._upload_session(file, commit)
+                finally:
+                    file.close()
+
+        except Exception as e:
+            print(f"Error uploading to Dropbox: {e}")
+            return None
+
+    async def _upload_session(self, file, commit):
+        # Start, append all but the last chunk, finish with the last; reads stay off the event loop
+        chunk = await asyncio.to_thread(file.read, CHUNK_SIZE)
+        session = await self._content("files/upload_session/start", {"close": False}, chunk)
+        cursor = {"session_id": session["session_id"], "offset": len(chunk)}
+        chunk = await asyncio.to_thread(file.read, CHUNK_SIZE)
+        while True:
+            next_chunk = await asyncio.to_thread(file.read, CHUNK_SIZE)
+            if not next_chunk:
+                break
+            await self._content("files/upload_session/append_v2", {"cursor": cursor}, chunk)
+            cursor["offset"] += len(chunk)
+            chunk = next_chunk
+        return await self._content(
+            "files/upload_session/finish", {"cursor": cursor, "commit": commit}, chunk
+        )
+
+    async def upload_to_dropbox(self, local_file_path, dropbox_folder, filename):
+        """
+        Upload a file to Dropbox
+
+        Returns:
+            bool: True if upload successful, False otherwise
+        """
+
+        return await self.upload_file(local_file_path, dropbox_folder, filename) is not None
+
+    async def create_folder(self, folder_path):
+        """
+        Create a folder in Dropbox
+
+        Args:
+            folder_path (str): Path of the folder to create
+
+        Returns:
+            bool: True if folder created or already exists, False otherwise
+        """
+
+        try:
+            await self._rpc("files/create_folder_v2", {"path": _normalize_path(folder_path)})
+            return True
+        except DropboxHTTPError as e:
+            # Folder might already exist
+            if e.status_code == 409 and e.error_summary.startswith("path/conflict"):
+                return True
+            print(f"Error creating folder: {e}")
+            return False
+        except Exception as e:
+            print(f"Unexpected error creating folder: {e}")
+            return False
+
+    async def list_files(self, folder_path=""):
+        """
+        List files in a Dropbox folder
+
+        Args:
+            folder_path (str): Path of the folder to list
+
+        Returns:
+            list: List of file names, empty list if error
+        """
+
+        try:
+            result = await self._rpc("files/list_folder", {"path": _normalize_path(folder_path)})
+            files = [entry["name"] for entry in result["entries"] if entry[".tag"] == "file"]
+            while result.get("has_more"):
+                result = await self._rpc("files/list_folder/continue", {"cursor": result["cursor"]})
+                files.extend(entry["name"] for entry in result["entries"] if entry[".tag"] == "file")
+            return files
+
+        except Exception as e:
+            print(f"Error listing files: {e}")
+            return []
+
+    async def get_download_link(self, file_path):
+        """
+        Get a temporary download link for a file in Dropbox
+
+        Args:
+            file_path (str): Path to the file in Dropbox
+
+        Returns:
+            str: Download link or None if error
+        """
+
+        try:
+            result = await self._rpc("files/get_temporary_link", {"path": _normalize_path(file_path)})
+            return result["link"]
+
+        except Exception as e:
+            print(f"Error getting download link: {e}")
+            return None
+
+
+def upload_many(items, access_token, max_connections=100, **client_options):
+    """
+    Synchronous facade: upload many files concurrently on one event loop
+
+    A fixed set of max_connections workers takes items in turn, so the
+    number of tasks, open files and in-flight requests stays bounded
+    however many items there are.
+
+    Args:
+        items (iterable): (local_file_path, dropbox_folder, filename) tuples
+        access_token (str): Dropbox access token
+        max_connections (int): Size of the HTTP connection pool
+        **client_options: Extra AsyncDropboxClient arguments
+
+    Returns:
+        list: Upload result (bool) for each item, in order
+    """
+
+    items = list(items)
+    results = [False] * len(items)
+
+    async def worker(client, queue):
+        # Single-threaded event loop, so the shared iterator needs no lock
+        for index, item in queue:
+            results[index] = await client.upload_to_dropbox(*item)
+
+    async def run():
+        async with AsyncDropboxClient(access_token, max_connections, **client_options) as client:
+            queue = iter(enumerate(items))
+            await asyncio.gather(*(worker(client, queue) for _ in range(min(max_connections, len(items)))))
+        return results
+
+    return asyncio.run(run())
+
+
+def run_sync(access_token, method, *args, **client_options):
+    """
+    Synchronous facade for a single AsyncDropboxClient call
+
+    Args:
+        access_token (str): Dropbox access token
+        method (str): Client method name, e.g. "list_files"
+        *args: Method arguments
+        **client_options: Extra AsyncDropboxClient arguments
+
+    Returns:
+        The method's return value
+    """
+
+    async def run():
+        async with AsyncDropboxClient(access_token, **client_options) as client:
+            return await getattr(client, method)(*args)
+
+    return asyncio.run(run())
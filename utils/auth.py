@@ -1,50 +1,275 @@
 # utils/auth.py
+import base64
 import hashlib
+import hmac
+import json
+import os
+import secrets
+import time
 import streamlit as st
+from utils.rate_limiter import TokenBucket
 
-def hash_key(key):
+# scrypt cost parameters (about 16MB of memory per check)
+SCRYPT_N = 2 ** 14
+SCRYPT_R = 8
+SCRYPT_P = 1
+
+# Login attempt limits: per client, and across all clients to protect render capacity
+CLIENT_ATTEMPT_RATE = 0.1  # one attempt every 10 seconds
+CLIENT_ATTEMPT_BURST = 5
+GLOBAL_ATTEMPT_RATE = 5.0
+GLOBAL_ATTEMPT_BURST = 20
+
+# Signed session tokens, carried in the URL so any replica can resume a session
+SESSION_TOKEN_TTL = 12 * 60 * 60  # 12 hours
+SESSION_QUERY_PARAM = "session"
+
+# Set once the shared "anonymous" rate-limit key has been warned about
+_warned_anonymous = False
+
+def hash_key(key, salt=None):
     """
-    Generate SHA-256 hash of the key
+    Generate a salted scrypt hash of the key
     
     Args:
         key (str): The key to hash
+        salt (bytes): Salt to use, random if None
     
     Returns:
-        str: SHA-256 hash of the key
+        str: Hash in the form "scrypt$n$r$p$salt_hex$hash_hex"
     """
-    return hashlib.sha256(key.encode()).hexdigest()
+    if salt is None:
+        salt = os.urandom(16)
+    digest = hashlib.scrypt(key.encode(), salt=salt, n=SCRYPT_N, r=SCRYPT_R, p=SCRYPT_P)
+    return f"scrypt${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}${salt.hex()}${digest.hex()}"
 
-def verify_access_key(input_key):
+def check_key(input_key, stored_hash):
     """
-    Verify if the input key matches the stored hash
+    Check a key against a stored hash in constant time
     
     Args:
         input_key (str): The key entered by user
+        stored_hash (str): scrypt hash from hash_key, or a legacy SHA-256 hex digest
     
     Returns:
-        bool: True if key is correct, False otherwise
+        bool: True if the key matches, False otherwise
     """
-    try:
-        # Get the stored hash from Streamlit secrets
-        stored_hash = st.secrets["auth"]["access_key_hash"]
+    if stored_hash.startswith("scrypt$"):
+        _, n, r, p, salt, expected = stored_hash.split("$")
+        digest = hashlib.scrypt(
+            input_key.encode(), salt=bytes.fromhex(salt), n=int(n), r=int(r), p=int(p)
+        )
+        return hmac.compare_digest(digest, bytes.fromhex(expected))
+    
+    # Legacy unsalted SHA-256 hashes
+    return hmac.compare_digest(hashlib.sha256(input_key.encode()).hexdigest(), stored_hash)
+
+class AuthService:
+    """Process-wide access key verification with rate limiting"""
+    
+    def __init__(self, stored_hash, rate_limit_db=None, trusted_proxies=0):
+        """
+        Args:
+            stored_hash (str): Access key hash
+            rate_limit_db (str): SQLite file to share rate limits across workers,
+                in-process limits if None
+            trusted_proxies (int): Reverse proxies in front of the app whose
+                X-Forwarded-For entries can be trusted
+        """
+        self.stored_hash = stored_hash
+        self.trusted_proxies = trusted_proxies
+        self.client_limiter = TokenBucket(CLIENT_ATTEMPT_RATE, CLIENT_ATTEMPT_BURST, rate_limit_db)
+        self.global_limiter = TokenBucket(GLOBAL_ATTEMPT_RATE, GLOBAL_ATTEMPT_BURST, rate_limit_db)
+    
+    def verify(self, input_key, client_id):
+        """
+        Verify an access key attempt
         
-        # Hash the input key
-        input_hash = hash_key(input_key)
+        Args:
+            input_key (str): The key entered by user
+            client_id (str): Identifier of the client making the attempt
         
-        # Compare hashes
-        return input_hash == stored_hash
+        Returns:
+            tuple: (authenticated, retry_after); retry_after is the number of
+                seconds to wait when the attempt was rate limited, else 0
+        """
+        # Rate limit before hashing so rejected attempts cost no KDF work
+        allowed, retry_after = self.client_limiter.consume(f"client:{client_id}")
+        if not allowed:
+            return False, retry_after
+        allowed, retry_after = self.global_limiter.consume("global")
+        if not allowed:
+            return False, retry_after
+        
+        return check_key(input_key, self.stored_hash), 0.0
+
+@st.cache_resource
+def get_auth_service():
+    """
+    Get the shared authentication service, loading secrets once per process
+    
+    Returns:
+        AuthService: The authentication service
+    """
+    auth_config = st.secrets["auth"]
+    return AuthService(
+        auth_config["access_key_hash"],
+        auth_config.get("rate_limit_db"),
+        int(auth_config.get("trusted_proxies", 0))
+    )
+
+@st.cache_resource
+def get_session_secret():
+    """
+    Get the key used to sign session tokens
+    
+    Tokens travel in URLs, so the key must be a separate secret: one derived
+    from the access key hash would let anyone holding a token brute-force
+    the access key offline.
+    
+    Returns:
+        bytes: Signing key, None if auth.session_secret is not set, in which
+            case no session tokens are issued or accepted
+    """
+    session_secret = st.secrets["auth"].get("session_secret")
+    if not session_secret:
+        print("Warning: auth.session_secret is not set; sessions cannot be resumed from the URL")
+        return None
+    return session_secret.encode()
+
+def _b64encode(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+def _b64decode(data):
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+def issue_session_token(session_id, secret, ttl=SESSION_TOKEN_TTL):
+    """
+    Create an HMAC-signed, expiring session token
+    
+    Args:
+        session_id (str): Session identifier
+        secret (bytes): Signing key
+        ttl (int): Lifetime in seconds
+    
+    Returns:
+        str: Token in the form "payload.signature"
+    
+    Raises:
+        ValueError: If no signing key is given
+    """
+    if not secret:
+        raise ValueError("A session secret is required to issue session tokens")
+    payload = _b64encode(json.dumps({"sid": session_id, "exp": int(time.time()) + ttl}).encode())
+    signature = hmac.new(secret, payload.encode(), hashlib.sha256).digest()
+    return f"{payload}.{_b64encode(signature)}"
+
+def verify_session_token(token, secret):
+    """
+    Check a session token's signature and expiry
+    
+    Args:
+        token (str): Token from issue_session_token
+        secret (bytes): Signing key
+    
+    Returns:
+        str: Session identifier, None if the token is invalid or expired
+    """
+    if not secret:
+        return None
+    try:
+        payload, signature = token.split(".")
+        expected = hmac.new(secret, payload.encode(), hashlib.sha256).digest()
+        if not hmac.compare_digest(expected, _b64decode(signature)):
+            return None
+        claims = json.loads(_b64decode(payload))
+        if claims["exp"] < time.time():
+            return None
+        return claims["sid"]
+    except (ValueError, KeyError, TypeError):
+        return None
+
+def get_client_id(trusted_proxies=0):
+    """
+    Identify the client for rate limiting
+    
+    X-Forwarded-For is set by the client as well as by proxies, so it is only
+    used when the app runs behind trusted proxies. Each proxy appends the
+    address it received the request from, so with N trusted proxies the
+    N-th entry from the right is the one added by the outermost proxy; the
+    entries to its left are client-supplied and ignored.
+    
+    Args:
+        trusted_proxies (int): Number of trusted reverse proxies in front of the app
+    
+    Returns:
+        str: Client IP address if available, otherwise "anonymous"; all
+            anonymous clients share one login rate limit
+    """
+    global _warned_anonymous
+    try:
+        if trusted_proxies > 0:
+            forwarded = st.context.headers.get("X-Forwarded-For")
+            if forwarded:
+                hops = [hop.strip() for hop in forwarded.split(",") if hop.strip()]
+                if len(hops) >= trusted_proxies:
+                    return hops[-trusted_proxies]
+        ip_address = getattr(st.context, "ip_address", None)
+        if ip_address:
+            return ip_address
+    except Exception:
+        pass
+    if not _warned_anonymous:
+        _warned_anonymous = True
+        print("Warning: client address unavailable (localhost, or a proxy not configured in "
+              "auth.trusted_proxies); all such clients share one login rate limit")
+    return "anonymous"
+
+def attempt_login(input_key):
+    """
+    Verify an access key attempt from the current client
+    
+    Args:
+        input_key (str): The key entered by user
+    
+    Returns:
+        tuple: (authenticated, retry_after) as returned by AuthService.verify
+    """
+    
+    try:
+        auth_service = get_auth_service()
+        return auth_service.verify(input_key, get_client_id(auth_service.trusted_proxies))
         
     except KeyError:
         st.error("❌ Authentication configuration not found. Please contact administrator.")
-        return False
+        return False, 0.0
     except Exception as e:
         st.error(f"❌ Authentication error: {str(e)}")
-        return False
+        return False, 0.0
 
-def check_authentication():
+def verify_access_key(input_key):
+    """
+    Verify if the input key matches the stored hash
+    
+    Args:
+        input_key (str): The key entered by user
+    
+    Returns:
+        bool: True if key is correct, False otherwise
+    """
+    
+    authenticated, _ = attempt_login(input_key)
+    return authenticated
+
+def check_authentication(session_store=None):
     """
     Handle authentication flow
     
+    Args:
+        session_store (SessionStore): Store of live sessions; when given,
+            a session token only resumes a session still in the store, so
+            logging out revokes the token
+    
     Returns:
         bool: True if authenticated, False otherwise
     """
@@ -53,6 +278,22 @@ def check_authentication():
     if 'authenticated' in st.session_state and st.session_state.authenticated:
         return True
     
+    # Resume from a signed session token (e.g. after a restart or on another replica)
+    token = st.query_params.get(SESSION_QUERY_PARAM)
+    if token:
+        try:
+            session_id = verify_session_token(token, get_session_secret())
+        except KeyError:
+            session_id = None
+        if session_id and session_store is not None and not session_store.exists(session_id):
+            # Logged out or expired: the token has been revoked
+            session_id = None
+        if session_id:
+            st.session_state.authenticated = True
+            st.session_state.session_id = session_id
+            return True
+        del st.query_params[SESSION_QUERY_PARAM]
+    
     # Show authentication form
     st.title("🔐 CV Generator - Authentication Required")
     st.markdown("---")
@@ -75,13 +316,23 @@ def check_authentication():
         
         if submit_button:
             if access_key:
-                if verify_access_key(access_key):
+                authenticated, retry_after = attempt_login(access_key)
+                if authenticated:
                     st.session_state.authenticated = True
+                    st.session_state.session_id = secrets.token_urlsafe(16)
+                    if session_store is not None:
+                        session_store.save(st.session_state.session_id, {'step': 1})
+                    session_secret = get_session_secret()
+                    if session_secret:
+                        st.query_params[SESSION_QUERY_PARAM] = issue_session_token(
+                            st.session_state.session_id, session_secret
+                        )
                     st.success("✅ Authentication successful! Redirecting...")
                     st.rerun()
+                elif retry_after:
+                    st.warning(f"⚠️ Too many attempts. Please wait {int(retry_after) + 1} seconds before trying again.")
                 else:
                     st.error("❌ Invalid access key. Please try again.")
-                    # Add a small delay to prevent brute force attempts
                     st.session_state.failed_attempts = st.session_state.get('failed_attempts', 0) + 1
                     
                     if st.session_state.failed_attempts >= 3:
@@ -96,10 +347,8 @@ def check_authentication():
         
         1. **Generate hash for your key:**
         ```python
-        import hashlib
-        key = "your_secret_key_here"
-        hash_value = hashlib.sha256(key.encode()).hexdigest()
-        print(hash_value)
+        from utils.auth import generate_hash_for_key
+        print(generate_hash_for_key("your_secret_key_here"))
         ```
         
         2. **Add to Streamlit secrets:**
@@ -107,19 +356,41 @@ def check_authentication():
         ```toml
         [auth]
         access_key_hash = "your_generated_hash_here"
+        # Optional: share login rate limits between server processes
+        rate_limit_db = "/var/lib/cv-generator/auth_limits.db"
+        # Optional: number of reverse proxies in front of the app that set
+        # X-Forwarded-For (0 = use the connection address)
+        trusted_proxies = 1
+        # Key for signing session tokens (same on every replica); without it
+        # sessions cannot be resumed from the URL
+        session_secret = "a_long_random_string"
         ```
         
+        Existing SHA-256 hashes keep working, but should be regenerated.
+        
         3. **Share the original key** (not the hash) with authorized users.
         """)
     
     return False
 
-def logout():
-    """Clear authentication from session"""
+def logout(session_store=None):
+    """
+    Clear authentication from session
+    
+    Args:
+        session_store (SessionStore): Store of live sessions; the session
+            is deleted from it so its token can no longer be used
+    """
+    if session_store is not None and st.session_state.get('session_id'):
+        session_store.delete(st.session_state.session_id)
     if 'authenticated' in st.session_state:
         del st.session_state.authenticated
     if 'failed_attempts' in st.session_state:
         del st.session_state.failed_attempts
+    if 'session_id' in st.session_state:
+        del st.session_state.session_id
+    if SESSION_QUERY_PARAM in st.query_params:
+        del st.query_params[SESSION_QUERY_PARAM]
 
 def generate_hash_for_key(key):
     """
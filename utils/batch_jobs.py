@@ -0,0 +1,281 @@
+# utils/batch_jobs.py
+import os
+import sqlite3
+import time
+from datetime import datetime
+from utils.cv_generator import generate_cv_pdf
+from utils.encryption import encrypt_pdf
+from utils.encryption_policy import EncryptionPolicy, derive_document_key, derive_document_keys
+from utils.dropbox_handler import upload_file, create_folders
+from utils.storage import shard_folder
+
+# Per-record states, in pipeline order
+STATE_PENDING = "pending"
+STATE_RENDERED = "rendered"
+STATE_ENCRYPTED = "encrypted"
+STATE_UPLOADED = "uploaded"
+STATE_FAILED = "failed"
+
+# Records whose encryption keys are derived together, in parallel
+KEY_BATCH_SIZE = 1000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    record_id TEXT PRIMARY KEY,
+    state TEXT NOT NULL,
+    pdf_path TEXT,
+    encrypted_path TEXT,
+    dropbox_rev TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    updated_at TEXT NOT NULL
+)
+"""
+
+
+class JobJournal:
+    """SQLite journal of per-record batch progress"""
+
+    def __init__(self, journal_path):
+        self.conn = sqlite3.connect(journal_path)
+        self.conn.row_factory = sqlite3.Row
+        # WAL keeps checkpoint writes cheap and survives crashes mid-run
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(_SCHEMA)
+        self.conn.commit()
+
+    def get(self, record_id):
+        """
+        Get the journal entry for a record
+
+        Args:
+            record_id (str): Record identifier
+
+        Returns:
+            sqlite3.Row: Journal entry, None if the record has not been seen
+        """
+
+        return self.conn.execute(
+            "SELECT * FROM records WHERE record_id = ?", (record_id,)
+        ).fetchone()
+
+    def update(self, record_id, state, **fields):
+        """
+        Checkpoint a record's state
+
+        Args:
+            record_id (str): Record identifier
+            state (str): New state
+            **fields: Other columns to set (pdf_path, encrypted_path, dropbox_rev, error)
+        """
+
+        columns = {"state": state, "updated_at": datetime.now().isoformat(), "error": None}
+        columns.update(fields)
+        names = ", ".join(columns)
+        placeholders = ", ".join("?" for _ in columns)
+        updates = ", ".join(f"{name} = excluded.{name}" for name in columns)
+        self.conn.execute(
+            f"INSERT INTO records (record_id, {names}) VALUES (?, {placeholders}) "
+            f"ON CONFLICT(record_id) DO UPDATE SET {updates}",
+            (record_id, *columns.values())
+        )
+        self.conn.commit()
+
+    def mark_failed(self, record_id, error):
+        """
+        Record a failure, keeping the last successful outputs for the retry
+
+        Args:
+            record_id (str): Record identifier
+            error (str): Error message
+        """
+
+        self.conn.execute(
+            "INSERT INTO records (record_id, state, attempts, error, updated_at) VALUES (?, ?, 1, ?, ?) "
+            "ON CONFLICT(record_id) DO UPDATE SET attempts = attempts + 1, "
+            "error = excluded.error, updated_at = excluded.updated_at",
+            (record_id, STATE_PENDING, error, datetime.now().isoformat())
+        )
+        self.conn.commit()
+
+    def counts(self):
+        """
+        Count records per state
+
+        Returns:
+            dict: state -> number of records; failures are counted separately
+        """
+
+        counts = dict(self.conn.execute(
+            "SELECT state, COUNT(*) FROM records GROUP BY state"
+        ).fetchall())
+        counts[STATE_FAILED] = self.conn.execute(
+            "SELECT COUNT(*) FROM records WHERE error IS NOT NULL"
+        ).fetchone()[0]
+        return counts
+
+    def close(self):
+        self.conn.close()
+
+
+def record_id_for(user_data):
+    """
+    Build the stable record identifier (also the final filename stem)
+
+    Args:
+        user_data (dict): CV data
+
+    Returns:
+        str: Identifier in the same "name-phone" form used for CV filenames
+    """
+
+    return f"{user_data['name'].replace(' ', '-')}-{user_data['phone']}"
+
+
+def _process(user_data, record_id, journal, output_dir, access_token, upload_folder,
+             encryption_policy, document_key):
+    entry = journal.get(record_id)
+    state = entry["state"] if entry else STATE_PENDING
+    final_filename = f"{record_id}.pdf"
+    final_path = os.path.join(output_dir, final_filename)
+
+    # Outputs from a previous run may have been cleaned up; fall back a stage
+    if state == STATE_ENCRYPTED and not os.path.exists(final_path):
+        state = STATE_PENDING
+    if state == STATE_RENDERED and not (entry["pdf_path"] and os.path.exists(entry["pdf_path"])):
+        state = STATE_PENDING
+
+    if state == STATE_PENDING:
+        pdf_path = generate_cv_pdf(user_data)
+        journal.update(record_id, STATE_RENDERED, pdf_path=pdf_path)
+        state = STATE_RENDERED
+    else:
+        pdf_path = entry["pdf_path"]
+
+    if state == STATE_RENDERED:
+        if document_key is None:
+            document_key = derive_document_key(encryption_policy, user_data)
+        encrypted_pdf_path = encrypt_pdf(pdf_path, document_key=document_key)
+        os.replace(encrypted_pdf_path, final_path)
+        os.remove(pdf_path)
+        journal.update(record_id, STATE_ENCRYPTED, encrypted_path=final_path)
+        state = STATE_ENCRYPTED
+
+    if state == STATE_ENCRYPTED and access_token:
+        # Normally created in bulk for the chunk already (and cached); this only
+        # calls Dropbox again if that bulk creation failed for this folder
+        if not create_folders(access_token, [upload_folder]):
+            raise Exception(f"Could not create Dropbox folder {upload_folder}")
+        metadata = upload_file(final_path, access_token, upload_folder, final_filename)
+        if metadata is None:
+            raise Exception("Upload to Dropbox failed")
+        journal.update(record_id, STATE_UPLOADED, dropbox_rev=metadata.rev)
+
+
+def _chunks(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def run_batch(records, journal_path, output_dir, access_token=None, dropbox_folder="/CVs",
+              folder_layout="flat", progress_callback=None, report_every=100, encryption_policy=None):
+    """
+    Render, encrypt and upload CVs for many records, resuming from a journal
+
+    Each record is checkpointed after every stage, so a restarted run skips
+    work that already completed and continues failed records from the last
+    successful stage.
+
+    Args:
+        records (iterable): user_data dicts or records with a to_user_data() method
+        journal_path (str): Path to the SQLite journal file
+        output_dir (str): Directory for the encrypted PDFs
+        access_token (str): Dropbox access token, uploads are skipped if None
+        dropbox_folder (str): Dropbox folder path
+        folder_layout (str): Folder sharding layout, see utils.storage.FOLDER_LAYOUTS
+        progress_callback (callable): Called with the progress report dict
+        report_every (int): Number of records between progress reports
+        encryption_policy (EncryptionPolicy): How PDFs are encrypted, DOB password if None
+
+    Returns:
+        dict: Final progress report
+    """
+
+    os.makedirs(output_dir, exist_ok=True)
+    journal = JobJournal(journal_path)
+    started = time.monotonic()
+    report = {"seen": 0, "processed": 0, "skipped": 0, "failed": 0}
+
+    def build_report():
+        elapsed = time.monotonic() - started
+        report["elapsed_seconds"] = elapsed
+        report["records_per_second"] = report["processed"] / elapsed if elapsed else 0.0
+        report["journal"] = journal.counts()
+        return report
+
+    encryption_policy = encryption_policy or EncryptionPolicy()
+    done_states = (STATE_UPLOADED,) if access_token else (STATE_ENCRYPTED, STATE_UPLOADED)
+
+    try:
+        for chunk in _chunks(records, KEY_BATCH_SIZE):
+            work = []
+            for record in chunk:
+                user_data = record.to_user_data() if hasattr(record, "to_user_data") else record
+                record_id = record_id_for(user_data)
+                entry = journal.get(record_id)
+                work.append((user_data, record_id, not (entry and entry["state"] in done_states)))
+
+            # Derive encryption keys for the whole chunk up front; records whose
+            # key fails here are retried (and fail individually) in _process
+            todo = [user_data for user_data, _, needed in work if needed]
+            try:
+                document_keys = iter(derive_document_keys(encryption_policy, todo))
+            except Exception as e:
+                print(f"Error deriving encryption keys, falling back to per-record: {e}")
+                document_keys = iter([None] * len(todo))
+
+            # Pre-create every shard folder the chunk uploads into with one batch call
+            upload_folders = {}
+            if access_token:
+                when = datetime.now()
+                upload_folders = {
+                    record_id: shard_folder(dropbox_folder, f"{record_id}.pdf", folder_layout, when)
+                    for _, record_id, needed in work if needed
+                }
+                if upload_folders and not create_folders(access_token, set(upload_folders.values())):
+                    print("Error pre-creating Dropbox folders, retrying per record")
+
+            for user_data, record_id, needed in work:
+                report["seen"] += 1
+                if not needed:
+                    report["skipped"] += 1
+                else:
+                    document_key = next(document_keys)
+                    try:
+                        _process(
+                            user_data, record_id, journal, output_dir, access_token,
+                            upload_folders.get(record_id), encryption_policy, document_key
+                        )
+                        report["processed"] += 1
+                    except Exception as e:
+                        journal.mark_failed(record_id, str(e))
+                        report["failed"] += 1
+                        print(f"Error processing {record_id}: {e}")
+
+                if progress_callback and report["seen"] % report_every == 0:
+                    progress_callback(build_report())
+
+        final_report = build_report()
+        if progress_callback:
+            progress_callback(final_report)
+        return final_report
+
+    finally:
+        journal.close()
@@ -0,0 +1,187 @@
+# utils/bulk_import.py
+import csv
+import os
+from datetime import date, datetime
+from dateutil import parser as date_parser
+from utils.records import QUALIFICATION_ORDER, Person, Education, WorkExperience
+
+# Column prefix used for each education level, e.g. "ug_institution", "ug_year"
+EDUCATION_COLUMN_PREFIXES = {
+    "10th": "10th",
+    "12th": "12th",
+    "Diploma": "diploma",
+    "UG (Bachelor's)": "ug",
+    "PG (Master's)": "pg",
+}
+
+# Same limit as the "Number of Previous Employers" input
+MAX_EMPLOYERS = 10
+
+
+def iter_rows(file_path, sheet_name=None):
+    """
+    Stream rows from a CSV or XLSX file as dicts keyed by header
+
+    Args:
+        file_path (str): Path to a .csv or .xlsx file
+        sheet_name (str): Worksheet to read for XLSX files, active sheet if None
+
+    Yields:
+        tuple: (row_number, row_dict) with row numbers counted from the header
+    """
+
+    extension = os.path.splitext(file_path)[1].lower()
+
+    if extension == ".csv":
+        with open(file_path, newline='', encoding='utf-8-sig') as file:
+            reader = csv.DictReader(file)
+            for row_number, row in enumerate(reader, start=2):
+                yield row_number, row
+
+    elif extension in (".xlsx", ".xlsm"):
+        import openpyxl
+
+        workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            sheet = workbook[sheet_name] if sheet_name else workbook.active
+            rows = sheet.iter_rows(values_only=True)
+            header = [str(cell).strip() if cell is not None else "" for cell in next(rows, ())]
+            for row_number, values in enumerate(rows, start=2):
+                yield row_number, dict(zip(header, values))
+        finally:
+            workbook.close()
+
+    else:
+        raise ValueError(f"Unsupported file type: {extension}")
+
+
+def _text(row, column):
+    value = row.get(column)
+    if value is None:
+        return ""
+    return str(value).strip()
+
+
+def _date(row, column, date_format=None):
+    value = row.get(column)
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    text = _text(row, column)
+    if not text:
+        return None
+    if date_format:
+        return datetime.strptime(text, date_format).date()
+    # ISO dates are unambiguous; dayfirst would swap their day and month
+    try:
+        return datetime.fromisoformat(text).date()
+    except ValueError:
+        return date_parser.parse(text, dayfirst=True).date()
+
+
+def _year(row, column):
+    value = row.get(column)
+    if isinstance(value, (datetime, date)):
+        return value.year
+    text = _text(row, column)
+    if not text:
+        return None
+    return int(float(text))
+
+
+def row_to_record(row, column_map=None, date_format=None):
+    """
+    Map an import row to a Person record
+
+    Args:
+        row (dict): Row keyed by column header
+        column_map (dict): Optional mapping of source header -> schema column
+        date_format (str): strptime format for text dates; if None, ISO dates
+            are read as such and anything else as day first (dd/mm/yyyy)
+
+    Returns:
+        Person: The record (not yet validated)
+    """
+
+    if column_map:
+        row = {column_map.get(key, key): value for key, value in row.items()}
+
+    highest_qualification = _text(row, "highest_qualification")
+    is_married = _text(row, "is_married").title() or "Single"
+
+    # Only the levels up to the highest qualification are collected, as in the form
+    if highest_qualification in QUALIFICATION_ORDER:
+        levels = QUALIFICATION_ORDER[:QUALIFICATION_ORDER.index(highest_qualification) + 1]
+    else:
+        levels = []
+
+    education = []
+    for level in levels:
+        prefix = EDUCATION_COLUMN_PREFIXES[level]
+        institution = _text(row, f"{prefix}_institution")
+        year = _year(row, f"{prefix}_year")
+        if institution and year:
+            education.append(Education(level, institution, year, _text(row, f"{prefix}_specialization")))
+
+    work_experience = []
+    for i in range(1, MAX_EMPLOYERS + 1):
+        company = _text(row, f"company_{i}")
+        position = _text(row, f"position_{i}")
+        if company and position:
+            work_experience.append(WorkExperience(
+                company,
+                position,
+                _date(row, f"start_date_{i}", date_format),
+                _date(row, f"end_date_{i}", date_format),
+                _text(row, f"responsibilities_{i}")
+            ))
+
+    return Person(
+        _text(row, "name"),
+        _text(row, "phone"),
+        _date(row, "dob", date_format),
+        is_married,
+        _text(row, "father_name"),
+        _text(row, "husband_name") if is_married == "Married" else "",
+        highest_qualification,
+        education,
+        work_experience
+    )
+
+
+def iter_records(file_path, column_map=None, sheet_name=None, date_format=None):
+    """
+    Stream and validate candidate records from a CSV or XLSX export
+
+    Rows are read one at a time, so memory use does not grow with file size.
+
+    Args:
+        file_path (str): Path to a .csv or .xlsx file
+        column_map (dict): Optional mapping of source header -> schema column
+        sheet_name (str): Worksheet to read for XLSX files
+        date_format (str): strptime format for text dates, see row_to_record
+
+    Yields:
+        tuple: (row_number, record, errors); record is None and errors is
+            non-empty for rows that could not be imported
+    """
+
+    for row_number, row in iter_rows(file_path, sheet_name):
+        try:
+            record = row_to_record(row, column_map, date_format)
+        except (ValueError, OverflowError) as e:
+            yield row_number, None, [f"Could not parse row: {str(e)}"]
+            continue
+
+        errors = record.validate()
+        if record.dob is None:
+            errors.append("Missing date of birth")
+        for exp in record.work_experience:
+            if exp.start_date is None or exp.end_date is None:
+                errors.append(f"Missing dates for employer {exp.company}")
+
+        if errors:
+            yield row_number, None, errors
+        else:
+            yield row_number, record, []
@@ -5,31 +5,108 @@ from reportlab.lib.units import inch
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
 from reportlab.lib import colors
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY
+import hashlib
 import os
+import uuid
 from datetime import datetime
+from utils.cv_model import build_cv_model, EDUCATION_HEADER
 
-def generate_cv_pdf(user_data):
-    """Generate a professional CV PDF from user data"""
+def pdf_content_hash(pdf_path):
+    """
+    Compute the SHA-256 hash of a PDF file
+    
+    Args:
+        pdf_path (str): Path to the PDF file
+    
+    Returns:
+        str: Hex digest of the file contents
+    """
+    
+    digest = hashlib.sha256()
+    with open(pdf_path, 'rb') as file:
+        for block in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def generate_cv_pdf(user_data, output_dir="temp", reproducible=False, generated_on=None):
+    """
+    Generate a professional CV PDF from user data into output_dir
+    
+    Args:
+        user_data (dict): CV data
+        output_dir (str): Directory for the generated file
+        reproducible (bool): Produce byte-identical output for identical input
+            (fixed creation dates and document ID in the PDF metadata)
+        generated_on (date): Date printed in the footer, today if None
+    
+    Returns:
+        str: Path to the generated PDF
+    """
     
-    # Create temp directory if it doesn't exist
-    temp_dir = "temp"
-    os.makedirs(temp_dir, exist_ok=True)
+    # Create output directory if it doesn't exist
+    os.makedirs(output_dir, exist_ok=True)
     
-    # Generate filename
+    # Generate filename (random suffix so concurrent requests never collide)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"cv_temp_{timestamp}.pdf"
-    filepath = os.path.join(temp_dir, filename)
+    filename = f"cv_temp_{timestamp}_{uuid.uuid4().hex[:12]}.pdf"
+    filepath = os.path.join(output_dir, filename)
+    
+    build_cv_document(filepath, build_cv_model(user_data, generated_on), reproducible=reproducible)
+    
+    return filepath
+
+class _PageLimitReached(Exception):
+    """Stops the layout once max_pages pages have been drawn"""
+
+def build_cv_document(target, model, reproducible=False, max_pages=None):
+    """
+    Lay out and write the CV to a path or binary file object
+    
+    Args:
+        target: File path or writable binary file object (e.g. io.BytesIO)
+        model (CVDocument): CV document model
+        reproducible (bool): Use fixed PDF dates and document ID
+        max_pages (int): Stop laying out content after this many pages, all if None
+    """
     
     # Create PDF document
     doc = SimpleDocTemplate(
-        filepath,
+        target,
         pagesize=A4,
         rightMargin=0.75*inch,
         leftMargin=0.75*inch,
         topMargin=0.75*inch,
-        bottomMargin=0.75*inch
+        bottomMargin=0.75*inch,
+        title=f"CV - {model.name}",
+        author=model.name,
+        creator="CV Generator",
+        invariant=1 if reproducible else 0
     )
     
+    if max_pages:
+        def after_page():
+            if doc.canv.getPageNumber() >= max_pages:
+                raise _PageLimitReached()
+        doc.afterPage = after_page
+    
+    try:
+        doc.build(build_cv_story(model))
+    except _PageLimitReached:
+        # Write out the pages drawn so far; the rest of the story is never laid out
+        doc.canv.showPage()
+        doc.canv.save()
+
+def build_cv_story(model):
+    """
+    Build the ReportLab flowables for a CV
+    
+    Args:
+        model (CVDocument): CV document model
+    
+    Returns:
+        list: Flowables making up the CV
+    """
+    
     # Define styles
     styles = getSampleStyleSheet()
     
@@ -67,25 +144,13 @@ def generate_cv_pdf(user_data):
     story = []
     
     # Header with name
-    story.append(Paragraph(user_data['name'].upper(), title_style))
+    story.append(Paragraph(model.name.upper(), title_style))
     story.append(Spacer(1, 12))
     
     # Personal Information Section
     story.append(Paragraph("PERSONAL INFORMATION", heading_style))
     
-    personal_info = [
-        ["Date of Birth:", user_data['dob'].strftime("%d/%m/%Y")],
-        ["Phone Number:", user_data['phone']],
-        ["Father's Name:", user_data['father_name']],
-    ]
-    
-    if user_data['is_married'] == "Married":
-        personal_info.append(["Marital Status:", "Married"])
-        personal_info.append(["Husband's Name:", user_data['husband_name']])
-    else:
-        personal_info.append(["Marital Status:", "Single"])
-    
-    personal_table = Table(personal_info, colWidths=[2*inch, 4*inch])
+    personal_table = Table([list(row) for row in model.personal_info], colWidths=[2*inch, 4*inch])
     personal_table.setStyle(TableStyle([
         ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
         ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
@@ -101,20 +166,7 @@ def generate_cv_pdf(user_data):
     # Education Section
     story.append(Paragraph("EDUCATIONAL QUALIFICATIONS", heading_style))
     
-    education_data = [["Qualification", "Institution/Board", "Year", "Specialization"]]
-    
-    # Order education from highest to lowest
-    education_order = ["PG (Master's)", "UG (Bachelor's)", "Diploma", "12th", "10th"]
-    
-    for level in education_order:
-        if level in user_data['education']:
-            edu = user_data['education'][level]
-            education_data.append([
-                level,
-                edu['institution'],
-                str(edu['year']),
-                edu.get('specialization', 'N/A')
-            ])
+    education_data = [list(EDUCATION_HEADER)] + [list(row) for row in model.education_rows]
     
     education_table = Table(education_data, colWidths=[1.5*inch, 2.5*inch, 1*inch, 2*inch])
     education_table.setStyle(TableStyle([
@@ -132,31 +184,29 @@ def generate_cv_pdf(user_data):
     story.append(Spacer(1, 20))
     
     # Work Experience Section
-    if user_data['work_experience']:
+    if model.experience:
         story.append(Paragraph("WORK EXPERIENCE", heading_style))
         
-        for i, exp in enumerate(user_data['work_experience']):
+        for i, exp in enumerate(model.experience):
             # Company and position
-            exp_header = f"<b>{exp['position']}</b> at <b>{exp['company']}</b>"
+            exp_header = f"<b>{exp.position}</b> at <b>{exp.company}</b>"
             story.append(Paragraph(exp_header, normal_style))
             
             # Duration
-            duration = f"Duration: {exp['start_date'].strftime('%m/%Y')} - {exp['end_date'].strftime('%m/%Y')}"
-            story.append(Paragraph(duration, normal_style))
+            story.append(Paragraph(f"Duration: {exp.duration}", normal_style))
             
             # Responsibilities
-            if exp['responsibilities']:
+            if exp.responsibilities:
                 story.append(Paragraph(f"<b>Key Responsibilities:</b>", normal_style))
-                story.append(Paragraph(exp['responsibilities'], normal_style))
+                story.append(Paragraph(exp.responsibilities, normal_style))
             
-            if i < len(user_data['work_experience']) - 1:
+            if i < len(model.experience) - 1:
                 story.append(Spacer(1, 15))
         
         story.append(Spacer(1, 20))
     
     # Footer
     story.append(Spacer(1, 30))
-    footer_text = f"CV generated on {datetime.now().strftime('%d/%m/%Y')}"
     footer_style = ParagraphStyle(
         'Footer',
         parent=styles['Normal'],
@@ -164,9 +214,6 @@ def generate_cv_pdf(user_data):
         alignment=TA_CENTER,
         textColor=colors.grey
     )
-    story.append(Paragraph(footer_text, footer_style))
-    
-    # Build PDF
-    doc.build(story)
+    story.append(Paragraph(model.footer, footer_style))
     
-    return filepath
\ No newline at end of file
+    return story
@@ -0,0 +1,83 @@
+# utils/cv_model.py
+from dataclasses import dataclass, field
+from datetime import datetime
+
+# Education is listed from highest to lowest
+EDUCATION_DISPLAY_ORDER = ["PG (Master's)", "UG (Bachelor's)", "Diploma", "12th", "10th"]
+EDUCATION_HEADER = ("Qualification", "Institution/Board", "Year", "Specialization")
+
+
+@dataclass(slots=True)
+class ExperienceEntry:
+    position: str
+    company: str
+    duration: str
+    responsibilities: str = ""
+
+
+@dataclass(slots=True)
+class CVDocument:
+    """Format-independent content of a CV, shared by all renderers"""
+
+    name: str
+    personal_info: list = field(default_factory=list)
+    education_rows: list = field(default_factory=list)
+    experience: list = field(default_factory=list)
+    footer: str = ""
+
+
+def build_cv_model(user_data, generated_on=None):
+    """
+    Build the CV document model from user data
+
+    Args:
+        user_data (dict): CV data
+        generated_on (date): Date printed in the footer, today if None
+
+    Returns:
+        CVDocument: The document model
+    """
+
+    if generated_on is None:
+        generated_on = datetime.now()
+
+    personal_info = [
+        ("Date of Birth:", user_data['dob'].strftime("%d/%m/%Y")),
+        ("Phone Number:", user_data['phone']),
+        ("Father's Name:", user_data['father_name']),
+    ]
+
+    if user_data['is_married'] == "Married":
+        personal_info.append(("Marital Status:", "Married"))
+        personal_info.append(("Husband's Name:", user_data['husband_name']))
+    else:
+        personal_info.append(("Marital Status:", "Single"))
+
+    education_rows = []
+    for level in EDUCATION_DISPLAY_ORDER:
+        if level in user_data['education']:
+            edu = user_data['education'][level]
+            education_rows.append((
+                level,
+                edu['institution'],
+                str(edu['year']),
+                edu.get('specialization', 'N/A')
+            ))
+
+    experience = [
+        ExperienceEntry(
+            exp['position'],
+            exp['company'],
+            f"{exp['start_date'].strftime('%m/%Y')} - {exp['end_date'].strftime('%m/%Y')}",
+            exp['responsibilities']
+        )
+        for exp in user_data['work_experience']
+    ]
+
+    return CVDocument(
+        user_data['name'],
+        personal_info,
+        education_rows,
+        experience,
+        f"CV generated on {generated_on.strftime('%d/%m/%Y')}"
+    )
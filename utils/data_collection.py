@@ -1,9 +1,18 @@
 # utils/data_collection.py
 import streamlit as st
 from datetime import datetime, date
+from utils.records import QUALIFICATION_ORDER, MIN_EDUCATION_YEAR, from_user_data
 
 def collect_user_data():
-    """Collect all user data for CV generation"""
+    """Collect all user data for CV generation, None until the form is valid"""
+    
+    user_data = collect_form_data()
+    if not validate_user_data(user_data):
+        return None
+    return user_data
+
+def collect_form_data():
+    """Show the data entry form and return its current, possibly incomplete, contents"""
     
     # Basic Information
     st.subheader("Basic Information")
@@ -27,8 +36,7 @@ def collect_user_data():
     st.subheader("Education Information")
     
     # Determine highest qualification
-    qualification_levels = ["10th", "12th", "Diploma", "UG (Bachelor's)", "PG (Master's)"]
-    highest_qualification = st.selectbox("Highest Qualification *", qualification_levels)
+    highest_qualification = st.selectbox("Highest Qualification *", QUALIFICATION_ORDER)
     
     # Collect education details based on highest qualification
     education_details = collect_education_details(highest_qualification)
@@ -64,21 +72,8 @@ def collect_user_data():
                     'responsibilities': responsibilities
                 })
     
-    # Validation
-    if not all([name, phone, father_name]):
-        st.warning("Please fill in all required fields marked with *")
-        return None
-    
-    if is_married == "Married" and not husband_name:
-        st.warning("Please enter husband's name")
-        return None
-    
-    if not education_details:
-        st.warning("Please fill in education details")
-        return None
-    
     # Compile all data
-    user_data = {
+    return {
         'name': name,
         'phone': phone,
         'dob': dob,
@@ -89,21 +84,37 @@ def collect_user_data():
         'education': education_details,
         'work_experience': work_experience
     }
+
+def validate_user_data(user_data):
+    """
+    Check the form contents, showing a warning for the first problem
     
-    return user_data
+    Uses the same rules as the bulk importer (Person.validate).
+    
+    Args:
+        user_data (dict): Form contents from collect_form_data
+    
+    Returns:
+        bool: True if the data is complete enough to generate a CV
+    """
+    
+    errors = from_user_data(user_data, validate=False).validate()
+    if errors:
+        st.warning(errors[0])
+        return False
+    
+    return True
 
 def collect_education_details(highest_qualification):
     """Collect education details based on highest qualification"""
     
     education_details = {}
     
-    # Define the order and required qualifications
-    qualification_order = ["10th", "12th", "Diploma", "UG (Bachelor's)", "PG (Master's)"]
-    highest_index = qualification_order.index(highest_qualification)
+    highest_index = QUALIFICATION_ORDER.index(highest_qualification)
     
     # Collect details for each level up to the highest
     for i in range(highest_index + 1):
-        level = qualification_order[i]
+        level = QUALIFICATION_ORDER[i]
         
         st.write(f"**{level} Details:**")
         col1, col2 = st.columns(2)
@@ -116,7 +127,7 @@ def collect_education_details(highest_qualification):
         
         with col2:
             year = st.number_input(f"Year of Completion", 
-                                 min_value=1980, 
+                                 min_value=MIN_EDUCATION_YEAR, 
                                  max_value=datetime.now().year,
                                  key=f"year_{level}")
         
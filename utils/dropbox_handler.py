@@ -1,7 +1,108 @@
 # utils/dropbox_handler.py
 import dropbox
-from dropbox.exceptions import ApiError, AuthError
+from dropbox.exceptions import ApiError, AuthError, RateLimitError
+import hashlib
 import os
+import threading
+import time
+from utils.rate_limiter import AdaptiveLimiter
+from utils.storage import StorageBackend
+
+# files_upload accepts at most 150MB; larger files go through an upload session
+SIMPLE_UPLOAD_LIMIT = 150 * 1024 * 1024  # 150MB
+CHUNK_SIZE = 4 * 1024 * 1024  # 4MB
+
+def _retry_after_for(exc):
+    """Return the Retry-After delay for a throttled Dropbox call, None otherwise"""
+    # The SDK raises RateLimitError for every 429 (too_many_requests and
+    # too_many_write_operations), with Retry-After in backoff when sent
+    if isinstance(exc, RateLimitError):
+        return exc.backoff or 0
+    return None
+
+# One limiter per access token, shared by every call in this module for that
+# token, so parallel uploads to an account back off together without a 429 on
+# one account slowing down the others
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+# Folders known to exist, per access token, so each is created at most once per process
+_known_folders = {}
+_known_folders_lock = threading.Lock()
+# files_create_folder_batch accepts at most 10,000 paths per call
+FOLDER_BATCH_SIZE = 10000
+
+def _client(access_token):
+    """Create a Dropbox client that leaves rate-limit retries to the token's limiter"""
+    return dropbox.Dropbox(access_token, max_retries_on_rate_limit=0)
+
+def _limiter_for(access_token):
+    """Return the limiter shared by all calls made with this access token"""
+    with _limiters_lock:
+        limiter = _limiters.get(access_token)
+        if limiter is None:
+            limiter = _limiters[access_token] = AdaptiveLimiter(retry_after_for=_retry_after_for)
+        return limiter
+
+def get_limiter_metrics(access_token):
+    """
+    Get current concurrency and throttling metrics for Dropbox calls
+    
+    Args:
+        access_token (str): Dropbox access token
+    
+    Returns:
+        dict: Limiter metrics for calls made with this token
+    """
+    
+    return _limiter_for(access_token).metrics()
+
+def _normalize_folder(dropbox_folder):
+    """Return the folder path with a leading and trailing '/'"""
+    if not dropbox_folder.startswith('/'):
+        dropbox_folder = '/' + dropbox_folder
+    if not dropbox_folder.endswith('/'):
+        dropbox_folder += '/'
+    return dropbox_folder
+
+def _upload_stream(dbx, limiter, fileobj, dropbox_path):
+    """
+    Upload a file object of any size in 4MB chunks using an upload session
+    
+    Args:
+        dbx (dropbox.Dropbox): Dropbox client
+        limiter (AdaptiveLimiter): Limiter for the client's access token
+        fileobj: Readable binary file object
+        dropbox_path (str): Full destination path in Dropbox
+    
+    Returns:
+        dropbox.files.FileMetadata: Metadata of the uploaded file
+    """
+    
+    chunk = fileobj.read(CHUNK_SIZE)
+    session = limiter.call(dbx.files_upload_session_start, chunk)
+    cursor = dropbox.files.UploadSessionCursor(session_id=session.session_id, offset=len(chunk))
+    
+    # Read one chunk ahead so the last chunk is sent with the commit
+    chunk = fileobj.read(CHUNK_SIZE)
+    while True:
+        next_chunk = fileobj.read(CHUNK_SIZE)
+        if not next_chunk:
+            break
+        limiter.call(dbx.files_upload_session_append_v2, chunk, cursor)
+        cursor.offset += len(chunk)
+        chunk = next_chunk
+    
+    return limiter.call(
+        dbx.files_upload_session_finish,
+        chunk,
+        cursor,
+        dropbox.files.CommitInfo(
+            path=dropbox_path,
+            mode=dropbox.files.WriteMode.overwrite,
+            autorename=True
+        )
+    )
 
 def test_connection(access_token):
     """
@@ -15,9 +116,9 @@ def test_connection(access_token):
     """
     
     try:
-        dbx = dropbox.Dropbox(access_token)
+        dbx = _client(access_token)
         # Try to get account info to test connection
-        dbx.users_get_current_account()
+        _limiter_for(access_token).call(dbx.users_get_current_account)
         return True
     except AuthError:
         return False
@@ -38,28 +139,37 @@ def upload_to_dropbox(local_file_path, access_token, dropbox_folder, filename):
         bool: True if upload successful, False otherwise
     """
     
+    return upload_file(local_file_path, access_token, dropbox_folder, filename) is not None
+
+def upload_file(local_file_path, access_token, dropbox_folder, filename):
+    """
+    Upload a file to Dropbox and return its metadata
+    
+    Args:
+        local_file_path (str): Path to the local file
+        access_token (str): Dropbox access token
+        dropbox_folder (str): Dropbox folder path
+        filename (str): Name for the file in Dropbox
+    
+    Returns:
+        dropbox.files.FileMetadata: Metadata of the uploaded file (including rev), None if error
+    """
+    
     try:
         # Initialize Dropbox client
-        dbx = dropbox.Dropbox(access_token)
-        
-        # Ensure dropbox folder starts with '/'
-        if not dropbox_folder.startswith('/'):
-            dropbox_folder = '/' + dropbox_folder
-        
-        # Ensure dropbox folder ends with '/'
-        if not dropbox_folder.endswith('/'):
-            dropbox_folder += '/'
+        dbx = _client(access_token)
         
         # Create full dropbox path
-        dropbox_path = dropbox_folder + filename
+        dropbox_path = _normalize_folder(dropbox_folder) + filename
         
         # Read and upload file
         with open(local_file_path, 'rb') as file:
             file_size = os.path.getsize(local_file_path)
             
             # For files smaller than 150MB, use simple upload
-            if file_size <= 150 * 1024 * 1024:  # 150MB
-                dbx.files_upload(
+            if file_size <= SIMPLE_UPLOAD_LIMIT:
+                metadata = _limiter_for(access_token).call(
+                    dbx.files_upload,
                     file.read(),
                     dropbox_path,
                     mode=dropbox.files.WriteMode.overwrite,
@@ -67,39 +177,19 @@ def upload_to_dropbox(local_file_path, access_token, dropbox_folder, filename):
                 )
             else:
                 # For larger files, use session upload
-                upload_session_start_result = dbx.files_upload_session_start(
-                    file.read(4 * 1024 * 1024)  # 4MB chunks
-                )
-                cursor = dropbox.files.UploadSessionCursor(
-                    session_id=upload_session_start_result.session_id,
-                    offset=file.tell()
-                )
-                
-                # Upload remaining chunks
-                while file.tell() < file_size:
-                    chunk = file.read(4 * 1024 * 1024)
-                    if len(chunk) <= 4 * 1024 * 1024:
-                        dbx.files_upload_session_finish(
-                            chunk,
-                            cursor,
-                            dropbox.files.CommitInfo(path=dropbox_path)
-                        )
-                        break
-                    else:
-                        dbx.files_upload_session_append_v2(chunk, cursor)
-                        cursor.offset = file.tell()
+                metadata = _upload_stream(dbx, _limiter_for(access_token), file, dropbox_path)
         
-        return True
+        return metadata
         
     except AuthError:
         print("Authentication failed. Check your access token.")
-        return False
+        return None
     except ApiError as e:
         print(f"API error: {e}")
-        return False
+        return None
     except Exception as e:
         print(f"Unexpected error: {e}")
-        return False
+        return None
 
 def create_folder(access_token, folder_path):
     """
@@ -114,13 +204,13 @@ def create_folder(access_token, folder_path):
     """
     
     try:
-        dbx = dropbox.Dropbox(access_token)
+        dbx = _client(access_token)
         
         # Ensure folder path starts with '/'
         if not folder_path.startswith('/'):
             folder_path = '/' + folder_path
         
-        dbx.files_create_folder_v2(folder_path)
+        _limiter_for(access_token).call(dbx.files_create_folder_v2, folder_path)
         return True
         
     except ApiError as e:
@@ -134,6 +224,83 @@ def create_folder(access_token, folder_path):
         print(f"Unexpected error creating folder: {e}")
         return False
 
+def _parent_folders(folder_path):
+    """Return folder_path and all of its parents, e.g. /a/b -> [/a, /a/b]"""
+    parts = folder_path.strip('/').split('/')
+    return ['/' + '/'.join(parts[:i]) for i in range(1, len(parts) + 1) if parts[0]]
+
+def create_folders(access_token, folder_paths):
+    """
+    Create many folders in Dropbox with files_create_folder_batch
+    
+    Folders already created (or found to exist) by this process are skipped.
+    
+    Args:
+        access_token (str): Dropbox access token
+        folder_paths (iterable): Paths of the folders to create
+    
+    Returns:
+        bool: True if all folders exist, False otherwise
+    """
+    
+    with _known_folders_lock:
+        known = _known_folders.setdefault(access_token, set())
+        missing = sorted({
+            _normalize_folder(path).rstrip('/') for path in folder_paths
+        } - known - {''})
+    
+    if not missing:
+        return True
+    
+    try:
+        dbx = _client(access_token)
+        limiter = _limiter_for(access_token)
+        ok = True
+        
+        for i in range(0, len(missing), FOLDER_BATCH_SIZE):
+            batch = missing[i:i + FOLDER_BATCH_SIZE]
+            launch = limiter.call(dbx.files_create_folder_batch, batch, autorename=False)
+            
+            if launch.is_async_job_id():
+                # Large batches complete asynchronously; poll until done
+                job_id = launch.get_async_job_id()
+                while True:
+                    status = limiter.call(dbx.files_create_folder_batch_check, job_id)
+                    if not status.is_in_progress():
+                        break
+                    time.sleep(1)
+                if status.is_failed():
+                    print(f"Error creating folders: {status.get_failed()}")
+                    ok = False
+                    continue
+                entries = status.get_complete().entries
+            elif launch.is_complete():
+                entries = launch.get_complete().entries
+            else:
+                print(f"Unexpected folder batch result: {launch}")
+                ok = False
+                continue
+            
+            created = []
+            for path, entry in zip(batch, entries):
+                if entry.is_success():
+                    created.append(path)
+                elif entry.get_failure().is_path() and entry.get_failure().get_path().is_conflict():
+                    created.append(path)  # Folder already exists
+                else:
+                    print(f"Error creating folder {path}: {entry.get_failure()}")
+                    ok = False
+            
+            with _known_folders_lock:
+                for path in created:
+                    known.update(_parent_folders(path))
+        
+        return ok
+        
+    except Exception as e:
+        print(f"Unexpected error creating folders: {e}")
+        return False
+
 def list_files(access_token, folder_path=""):
     """
     List files in a Dropbox folder
@@ -147,7 +314,7 @@ def list_files(access_token, folder_path=""):
     """
     
     try:
-        dbx = dropbox.Dropbox(access_token)
+        dbx = _client(access_token)
         
         # Ensure folder path starts with '/' but handle root folder
         if folder_path and not folder_path.startswith('/'):
@@ -155,7 +322,7 @@ def list_files(access_token, folder_path=""):
         elif not folder_path:
             folder_path = ''
         
-        result = dbx.files_list_folder(folder_path)
+        result = _limiter_for(access_token).call(dbx.files_list_folder, folder_path)
         files = []
         
         for entry in result.entries:
@@ -181,15 +348,43 @@ def get_download_link(access_token, file_path):
     """
     
     try:
-        dbx = dropbox.Dropbox(access_token)
+        dbx = _client(access_token)
         
         # Ensure file path starts with '/'
         if not file_path.startswith('/'):
             file_path = '/' + file_path
         
-        link = dbx.files_get_temporary_link(file_path)
+        link = _limiter_for(access_token).call(dbx.files_get_temporary_link, file_path)
         return link.link
         
     except Exception as e:
         print(f"Error getting download link: {e}")
-        return None
\ No newline at end of file
+        return None
+
+class DropboxStorage(StorageBackend):
+    """Storage backend that uploads to Dropbox"""
+    
+    name = "dropbox"
+    
+    def __init__(self, access_token):
+        self.access_token = access_token
+    
+    @property
+    def identity(self):
+        # A hash of the token rather than the token itself, since it ends up in the dedup index
+        return f"{self.name}:{hashlib.sha256(self.access_token.encode()).hexdigest()[:16]}"
+    
+    def put_file(self, local_file_path, folder, filename):
+        return upload_to_dropbox(local_file_path, self.access_token, folder, filename)
+    
+    def ensure_folders(self, folders):
+        return create_folders(self.access_token, folders)
+    
+    def put_fileobj(self, fileobj, folder, filename):
+        try:
+            dbx = _client(self.access_token)
+            _upload_stream(dbx, _limiter_for(self.access_token), fileobj, _normalize_folder(folder) + filename)
+            return True
+        except Exception as e:
+            print(f"Error uploading to Dropbox: {e}")
+            return False
@@ -1,14 +1,16 @@
 # utils/encryption.py
 import PyPDF2
 import os
+from utils.encryption_policy import apply_document_key
 
-def encrypt_pdf(input_path, password):
+def encrypt_pdf(input_path, password=None, document_key=None):
     """
-    Encrypt a PDF file with a password
+    Encrypt a PDF file with a password or a precomputed document key
     
     Args:
         input_path (str): Path to the input PDF file
-        password (str): Password to encrypt the PDF with
+        password (str): Password to encrypt the PDF with (PyPDF2 defaults)
+        document_key (DocumentKey): Key from utils.encryption_policy, used instead of password
     
     Returns:
         str: Path to the encrypted PDF file
@@ -30,7 +32,10 @@ def encrypt_pdf(input_path, password):
                 pdf_writer.add_page(page)
             
             # Encrypt the PDF
-            pdf_writer.encrypt(password)
+            if document_key is not None:
+                apply_document_key(pdf_writer, document_key)
+            else:
+                pdf_writer.encrypt(password)
             
             # Write the encrypted PDF
             with open(output_path, 'wb') as output_file:
@@ -0,0 +1,249 @@
+# utils/encryption_policy.py
+import hashlib
+import json
+import os
+import secrets
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from PyPDF2._security import _alg33, _alg34, _alg35
+from PyPDF2.constants import UserAccessPermissions
+from PyPDF2.generic import ArrayObject, ByteStringObject, DictionaryObject, NameObject, NumberObject
+
+# Password derived from the CV data, with the text shown to the user
+PASSWORD_SOURCES = {
+    "dob": (lambda user_data: user_data['dob'].strftime("%d%m%Y"),
+            "Your Date of Birth in DDMMYYYY format"),
+    "phone": (lambda user_data: user_data['phone'],
+              "Your Phone Number"),
+    "dob_phone": (lambda user_data: user_data['dob'].strftime("%d%m%Y") + user_data['phone'][-4:],
+                  "Your Date of Birth in DDMMYYYY format followed by the last 4 digits of your Phone Number"),
+}
+
+# Owner password: same as the user password, a fixed one from config, or random per document
+OWNER_PASSWORD_SOURCES = ("user", "fixed", "random")
+
+PERMISSIONS = {
+    "print": UserAccessPermissions.PRINT,
+    "print_high_quality": UserAccessPermissions.PRINT_TO_REPRESENTATION,
+    "modify": UserAccessPermissions.MODIFY,
+    "copy": UserAccessPermissions.EXTRACT,
+    "annotate": UserAccessPermissions.ADD_OR_MODIFY,
+    "fill_forms": UserAccessPermissions.FILL_FORM_FIELDS,
+    "accessibility": UserAccessPermissions.EXTRACT_TEXT_AND_GRAPHICS,
+    "assemble": UserAccessPermissions.ASSEMBLE_DOC,
+}
+
+# PyPDF2 3.x only writes the RC4 standard security handler (revision 2 and 3)
+CIPHERS = {
+    "rc4_128": {"V": 2, "rev": 3, "keylen": 16},
+    "rc4_40": {"V": 1, "rev": 2, "keylen": 5},
+}
+
+# P entry with every permission granted, as PyPDF2 writes it
+_ALL_PERMISSIONS = (2 ** 31 - 1) - 3
+
+# Below this many records key derivation is not worth starting worker processes
+PARALLEL_THRESHOLD = 64
+
+
+@dataclass(slots=True)
+class EncryptionPolicy:
+    """How CV PDFs are encrypted"""
+
+    password_source: str = "dob"
+    owner_password_source: str = "user"
+    owner_password: str = ""
+    permissions: tuple = tuple(PERMISSIONS)
+    cipher: str = "rc4_128"
+
+    def validate(self):
+        """
+        Check the policy against the supported options
+
+        Returns:
+            list: Error messages, empty if the policy is valid
+        """
+
+        errors = []
+        if self.password_source not in PASSWORD_SOURCES:
+            errors.append(f"Unknown password source: {self.password_source}")
+        if self.owner_password_source not in OWNER_PASSWORD_SOURCES:
+            errors.append(f"Unknown owner password source: {self.owner_password_source}")
+        if self.owner_password_source == "fixed" and not self.owner_password:
+            errors.append("A fixed owner password needs owner_password to be set")
+        unknown = set(self.permissions) - set(PERMISSIONS)
+        if unknown:
+            errors.append(f"Unknown permissions: {', '.join(sorted(unknown))}")
+        if self.cipher not in CIPHERS:
+            errors.append(f"Unsupported cipher: {self.cipher}")
+        return errors
+
+    def user_password(self, user_data):
+        return PASSWORD_SOURCES[self.password_source][0](user_data)
+
+    def password_hint(self):
+        return PASSWORD_SOURCES[self.password_source][1]
+
+    def owner_password_for(self, user_password):
+        if self.owner_password_source == "fixed":
+            return self.owner_password
+        if self.owner_password_source == "random":
+            return secrets.token_urlsafe(24)
+        return user_password
+
+    def fingerprint(self):
+        """
+        Short hash of every setting that changes the encrypted output
+
+        Combined with the content hash of the plain PDF, so that changing the
+        policy makes deduplicated uploads store the file again.
+
+        Returns:
+            str: Hex digest
+        """
+
+        settings = json.dumps([
+            self.password_source,
+            self.owner_password_source,
+            self.owner_password,
+            sorted(self.permissions),
+            self.cipher,
+        ])
+        return hashlib.sha256(settings.encode()).hexdigest()[:16]
+
+    def permissions_flag(self):
+        """P entry of the encryption dictionary"""
+        flag = _ALL_PERMISSIONS
+        for name, permission in PERMISSIONS.items():
+            if name not in self.permissions:
+                flag &= ~permission
+        return flag
+
+
+@dataclass(slots=True)
+class DocumentKey:
+    """Precomputed encryption dictionary values and key for one document"""
+
+    user_password: str
+    V: int
+    rev: int
+    keylen: int
+    P: int
+    O: bytes
+    U: bytes
+    key: bytes
+    document_id: tuple = field(default_factory=tuple)
+
+
+def load_policy(config=None):
+    """
+    Build an encryption policy from a config mapping (e.g. st.secrets["encryption"])
+
+    Args:
+        config (dict): Policy settings, defaults are used for missing keys
+
+    Returns:
+        EncryptionPolicy: The policy
+
+    Raises:
+        ValueError: If the settings are invalid
+    """
+
+    config = dict(config or {})
+    policy = EncryptionPolicy(
+        password_source=config.get("password_source", "dob"),
+        owner_password_source=config.get("owner_password_source", "user"),
+        owner_password=config.get("owner_password", ""),
+        permissions=tuple(config.get("permissions", PERMISSIONS)),
+        cipher=config.get("cipher", "rc4_128"),
+    )
+    errors = policy.validate()
+    if errors:
+        raise ValueError("Invalid encryption policy: " + "; ".join(errors))
+    return policy
+
+
+def derive_document_key(policy, user_data):
+    """
+    Derive the passwords and RC4 key for one document
+
+    Args:
+        policy (EncryptionPolicy): Encryption policy
+        user_data (dict): CV data
+
+    Returns:
+        DocumentKey: Values to encrypt the document with
+    """
+
+    cipher = CIPHERS[policy.cipher]
+    rev, keylen = cipher["rev"], cipher["keylen"]
+    user_password = policy.user_password(user_data)
+    P = policy.permissions_flag()
+
+    O = ByteStringObject(_alg33(policy.owner_password_for(user_password), user_password, rev, keylen))
+    id_1 = ByteStringObject(os.urandom(16))
+    if rev == 2:
+        U, key = _alg34(user_password, O, P, id_1)
+    else:
+        U, key = _alg35(user_password, rev, keylen, O, P, id_1, False)
+
+    return DocumentKey(user_password, cipher["V"], rev, keylen, P, bytes(O), bytes(U), bytes(key),
+                       (bytes(id_1), os.urandom(16)))
+
+
+def _derive_chunk(policy, chunk):
+    return [derive_document_key(policy, user_data) for user_data in chunk]
+
+
+def derive_document_keys(policy, records, max_workers=None):
+    """
+    Derive document keys for many records up front, in parallel
+
+    The key derivation (MD5 and RC4 rounds) is pure CPU work, so large
+    batches are spread over worker processes.
+
+    Args:
+        policy (EncryptionPolicy): Encryption policy
+        records (list): user_data dicts
+        max_workers (int): Worker processes, CPU count if None
+
+    Returns:
+        list: DocumentKey for each record, in order
+    """
+
+    records = list(records)
+    max_workers = max_workers or os.cpu_count() or 1
+    if max_workers == 1 or len(records) < PARALLEL_THRESHOLD:
+        return _derive_chunk(policy, records)
+
+    chunk_size = -(-len(records) // max_workers)
+    chunks = [records[i:i + chunk_size] for i in range(0, len(records), chunk_size)]
+    with ProcessPoolExecutor(max_workers=len(chunks)) as executor:
+        results = executor.map(_derive_chunk, [policy] * len(chunks), chunks)
+        return [document_key for chunk_keys in results for document_key in chunk_keys]
+
+
+def apply_document_key(pdf_writer, document_key):
+    """
+    Encrypt a PdfWriter with a precomputed document key
+
+    Equivalent to PdfWriter.encrypt() without redoing the key derivation.
+
+    Args:
+        pdf_writer (PyPDF2.PdfWriter): Writer holding the document pages
+        document_key (DocumentKey): Key from derive_document_key()
+    """
+
+    encrypt = DictionaryObject()
+    encrypt[NameObject("/Filter")] = NameObject("/Standard")
+    encrypt[NameObject("/V")] = NumberObject(document_key.V)
+    if document_key.V == 2:
+        encrypt[NameObject("/Length")] = NumberObject(document_key.keylen * 8)
+    encrypt[NameObject("/R")] = NumberObject(document_key.rev)
+    encrypt[NameObject("/O")] = ByteStringObject(document_key.O)
+    encrypt[NameObject("/U")] = ByteStringObject(document_key.U)
+    encrypt[NameObject("/P")] = NumberObject(document_key.P)
+
+    pdf_writer._ID = ArrayObject(ByteStringObject(part) for part in document_key.document_id)
+    pdf_writer._encrypt = pdf_writer._add_object(encrypt)
+    pdf_writer._encrypt_key = document_key.key
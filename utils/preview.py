@@ -0,0 +1,99 @@
+# utils/preview.py
+import io
+import time
+import streamlit as st
+from datetime import date
+from utils.cv_generator import build_cv_document
+from utils.cv_model import build_cv_model
+from utils.records import from_user_data, to_json, from_json
+
+PREVIEW_DPI = 50
+# Seconds the form must stay unchanged before a new preview is rendered
+PREVIEW_DEBOUNCE = 0.75
+
+def render_preview_png(user_data, dpi=PREVIEW_DPI):
+    """
+    Render page one of the CV as a low-resolution PNG
+    
+    Only the first page is laid out, in memory; nothing is written to disk,
+    encrypted or uploaded.
+    
+    Args:
+        user_data (dict): CV data
+        dpi (int): Resolution of the thumbnail
+    
+    Returns:
+        bytes: PNG image data
+    """
+    
+    import pymupdf
+    
+    buffer = io.BytesIO()
+    build_cv_document(buffer, build_cv_model(user_data, date.today()), max_pages=1)
+    
+    with pymupdf.open(stream=buffer.getvalue(), filetype="pdf") as document:
+        return document[0].get_pixmap(dpi=dpi).tobytes("png")
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def _cached_preview(form_state):
+    return render_preview_png(from_json(form_state).to_user_data())
+
+def show_preview(user_data):
+    """
+    Show a live thumbnail of the CV for the current form state
+    
+    Args:
+        user_data (dict): Form contents, complete or not, from collect_form_data
+    """
+    
+    if not st.toggle("👁️ Live Preview", value=True):
+        return
+    
+    # Compact, canonical serialization of the form doubles as the cache key
+    form_state = to_json(from_user_data(user_data, validate=False))
+    if st.session_state.get('preview_pending') != form_state:
+        st.session_state.preview_pending = form_state
+        st.session_state.preview_changed_at = time.monotonic()
+    
+    if st.session_state.get('preview_state') is None:
+        # Nothing to show yet: render the first preview straight away
+        _render_preview(form_state)
+    
+    if st.session_state.preview_state == form_state:
+        _show_preview_image(up_to_date=True)
+    else:
+        _pending_preview()
+
+def _render_preview(form_state):
+    try:
+        st.session_state.preview_image = _cached_preview(form_state)
+        st.session_state.preview_error = None
+    except ImportError:
+        st.session_state.preview_error = "Install PyMuPDF to enable the live preview"
+    except Exception as e:
+        st.session_state.preview_error = f"⚠️ Preview unavailable: {str(e)}"
+    st.session_state.preview_state = form_state
+
+def _show_preview_image(up_to_date):
+    if st.session_state.get('preview_error'):
+        st.info(st.session_state.preview_error)
+    elif st.session_state.get('preview_image'):
+        st.image(
+            st.session_state.preview_image,
+            caption="Page 1 preview" if up_to_date else "Updating preview..."
+        )
+
+@st.fragment(run_every=PREVIEW_DEBOUNCE)
+def _pending_preview():
+    # Only shown while the preview is stale. It reruns on its own every
+    # PREVIEW_DEBOUNCE seconds without blocking the form, and renders once the
+    # form has stayed unchanged for that long, so only the last of a burst of
+    # edits gets rendered. The full rerun afterwards swaps this polling
+    # fragment for a static image.
+    form_state = st.session_state.preview_pending
+    if st.session_state.preview_state != form_state:
+        if time.monotonic() - st.session_state.preview_changed_at < PREVIEW_DEBOUNCE:
+            _show_preview_image(up_to_date=False)
+            return
+        _render_preview(form_state)
+    st.rerun()
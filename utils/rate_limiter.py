@@ -0,0 +1,352 @@
+# utils/rate_limiter.py
+import asyncio
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class RateLimited(Exception):
+    """Raised by a call when the server asks the client to slow down"""
+
+    def __init__(self, retry_after=None):
+        super().__init__(f"Rate limited, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class AdaptiveLimiter:
+    """
+    AIMD concurrency limiter
+
+    The number of calls allowed in flight grows by one after each window of
+    successful calls and is halved whenever the server throttles us. A
+    throttle response also pauses all new calls until its Retry-After
+    delay has passed.
+    """
+
+    def __init__(self, initial_limit=4, min_limit=1, max_limit=32, decrease_factor=0.5,
+                 default_retry_after=1.0, max_retries=5, retry_after_for=None):
+        """
+        Args:
+            initial_limit (int): Starting number of concurrent calls
+            min_limit (int): Lower bound for the concurrency limit
+            max_limit (int): Upper bound for the concurrency limit
+            decrease_factor (float): Multiplier applied to the limit on throttle
+            default_retry_after (float): Pause in seconds when no Retry-After is given
+            max_retries (int): Retries of a throttled call before giving up
+            retry_after_for (callable): Maps an exception to a Retry-After delay
+                (seconds, or 0 if unknown), or None if it is not a throttle
+        """
+
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.decrease_factor = decrease_factor
+        self.default_retry_after = default_retry_after
+        self.max_retries = max_retries
+        self.retry_after_for = retry_after_for or _default_retry_after_for
+
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._paused_until = 0.0
+        self._successes = 0
+        self._throttled = 0
+        self._failures = 0
+        self._wait_seconds = 0.0
+
+    def acquire(self):
+        """Block until a call may start"""
+
+        started = time.monotonic()
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    self._cond.wait(self._paused_until - now)
+                elif self._in_flight >= int(self.limit):
+                    self._cond.wait()
+                else:
+                    break
+            self._in_flight += 1
+            self._wait_seconds += time.monotonic() - started
+
+    def release(self, throttled=False, retry_after=None, failed=False):
+        """
+        Finish a call and adjust the limit
+
+        Args:
+            throttled (bool): Whether the call was throttled by the server
+            retry_after (float): Server-provided delay before the next call
+            failed (bool): Whether the call failed for another reason (limit unchanged)
+        """
+
+        with self._cond:
+            self._update(throttled, retry_after, failed)
+            self._cond.notify_all()
+
+    def _update(self, throttled, retry_after, failed):
+        # Caller holds the lock
+        self._in_flight -= 1
+        if failed:
+            self._failures += 1
+        elif throttled:
+            self._throttled += 1
+            now = time.monotonic()
+            # Calls already in flight when we were throttled count as one congestion event
+            if now >= self._paused_until:
+                self.limit = max(self.min_limit, self.limit * self.decrease_factor)
+            delay = retry_after if retry_after else self.default_retry_after
+            self._paused_until = max(self._paused_until, now + delay)
+        else:
+            self._successes += 1
+            # Additive increase: +1 per limit's worth of successes
+            self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+
+    def call(self, func, *args, **kwargs):
+        """
+        Run func under the limiter, retrying when it is throttled
+
+        Returns:
+            The return value of func
+        """
+
+        attempt = 0
+        while True:
+            self.acquire()
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                retry_after = self.retry_after_for(e)
+                if retry_after is None:
+                    self.release(failed=True)
+                    raise
+                self.release(throttled=True, retry_after=retry_after)
+                attempt += 1
+                if attempt > self.max_retries:
+                    raise
+                continue
+            self.release()
+            return result
+
+    def metrics(self):
+        """
+        Snapshot of the limiter state
+
+        Returns:
+            dict: Current limit, calls in flight and throttling counters
+        """
+
+        with self._cond:
+            return self._snapshot()
+
+    def _snapshot(self):
+        return {
+            "concurrency_limit": int(self.limit),
+            "in_flight": self._in_flight,
+            "successes": self._successes,
+            "throttled": self._throttled,
+            "failures": self._failures,
+            "paused_for_seconds": max(0.0, self._paused_until - time.monotonic()),
+            "total_wait_seconds": self._wait_seconds,
+        }
+
+
+class AsyncAdaptiveLimiter(AdaptiveLimiter):
+    """AdaptiveLimiter for coroutines sharing one event loop"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cond = asyncio.Condition()
+
+    async def acquire(self):
+        """Wait until a call may start"""
+
+        started = time.monotonic()
+        async with self._cond:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    try:
+                        await asyncio.wait_for(self._cond.wait(), self._paused_until - now)
+                    except asyncio.TimeoutError:
+                        pass
+                elif self._in_flight >= int(self.limit):
+                    await self._cond.wait()
+                else:
+                    break
+            self._in_flight += 1
+            self._wait_seconds += time.monotonic() - started
+
+    async def release(self, throttled=False, retry_after=None, failed=False):
+        """Finish a call and adjust the limit, see AdaptiveLimiter.release"""
+
+        async with self._cond:
+            self._update(throttled, retry_after, failed)
+            self._cond.notify_all()
+
+    async def call(self, func, *args, **kwargs):
+        """
+        Await func(*args, **kwargs) under the limiter, retrying when it is throttled
+
+        Returns:
+            The result of the coroutine
+        """
+
+        attempt = 0
+        while True:
+            await self.acquire()
+            try:
+                result = await func(*args, **kwargs)
+            except Exception as e:
+                retry_after = self.retry_after_for(e)
+                if retry_after is None:
+                    await self.release(failed=True)
+                    raise
+                await self.release(throttled=True, retry_after=retry_after)
+                attempt += 1
+                if attempt > self.max_retries:
+                    raise
+                continue
+            await self.release()
+            return result
+
+    def metrics(self):
+        """
+        Snapshot of the limiter state
+
+        Returns:
+            dict: Current limit, calls in flight and throttling counters
+        """
+
+        # Single-threaded event loop, so no lock is needed to read
+        return self._snapshot()
+
+
+def _default_retry_after_for(exc):
+    if isinstance(exc, RateLimited):
+        return exc.retry_after or 0
+    return None
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter keyed by client
+
+    Buckets are kept in memory (shared by all sessions in the process) or,
+    when db_path is given, in a SQLite file so that several server
+    processes share the same limits. A bucket untouched for long enough to
+    refill completely is the same as a missing one, so it is evicted.
+    """
+
+    def __init__(self, rate, capacity, db_path=None, max_buckets=100000):
+        """
+        Args:
+            rate (float): Tokens added per second
+            capacity (float): Maximum tokens a bucket can hold (burst size)
+            db_path (str): SQLite file for buckets shared across processes
+            max_buckets (int): In-memory buckets kept before the least recently
+                used ones are dropped
+        """
+
+        self.rate = rate
+        self.capacity = capacity
+        self.db_path = db_path
+        self.max_buckets = max_buckets
+        # Seconds for an empty bucket to refill completely
+        self.refill_seconds = capacity / rate
+        self._lock = threading.Lock()
+        # Ordered by last update, oldest first
+        self._buckets = OrderedDict()
+        self._last_purge = 0.0
+
+        if db_path:
+            with self._connect() as conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS buckets "
+                    "(key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+                )
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=5, isolation_level=None)
+
+    def _refill(self, tokens, updated, now):
+        return min(self.capacity, tokens + (now - updated) * self.rate)
+
+    def consume(self, key, tokens=1):
+        """
+        Take tokens from a client's bucket
+
+        Args:
+            key (str): Client identifier
+            tokens (float): Tokens to take
+
+        Returns:
+            tuple: (allowed, retry_after) where retry_after is the number of
+                seconds until enough tokens are available (0 if allowed)
+        """
+
+        # Wall-clock time so that separate processes agree
+        now = time.time()
+
+        if not self.db_path:
+            with self._lock:
+                available, updated = self._buckets.pop(key, (self.capacity, now))
+                available = self._refill(available, updated, now)
+                allowed = available >= tokens
+                if allowed:
+                    available -= tokens
+                self._buckets[key] = (available, now)
+                self._evict(now)
+        else:
+            conn = self._connect()
+            try:
+                # IMMEDIATE takes the write lock up front so read-modify-write is atomic
+                conn.execute("BEGIN IMMEDIATE")
+                row = conn.execute(
+                    "SELECT tokens, updated FROM buckets WHERE key = ?", (key,)
+                ).fetchone()
+                available = self._refill(*row, now) if row else self.capacity
+                allowed = available >= tokens
+                if allowed:
+                    available -= tokens
+                conn.execute(
+                    "INSERT OR REPLACE INTO buckets (key, tokens, updated) VALUES (?, ?, ?)",
+                    (key, available, now)
+                )
+                # At most once per refill period, drop buckets that are full again
+                if now - self._last_purge >= self.refill_seconds:
+                    conn.execute(
+                        "DELETE FROM buckets WHERE updated < ?", (now - self.refill_seconds,)
+                    )
+                    self._last_purge = now
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            finally:
+                conn.close()
+
+        if allowed:
+            return True, 0.0
+        return False, (tokens - available) / self.rate
+
+    def _evict(self, now):
+        # Caller holds the lock; the oldest buckets are at the front
+        cutoff = now - self.refill_seconds
+        while self._buckets:
+            key, (_, updated) = next(iter(self._buckets.items()))
+            if updated >= cutoff and len(self._buckets) <= self.max_buckets:
+                break
+            del self._buckets[key]
+
+    def __len__(self):
+        """Number of buckets currently stored"""
+
+        if not self.db_path:
+            with self._lock:
+                return len(self._buckets)
+        conn = self._connect()
+        try:
+            return conn.execute("SELECT COUNT(*) FROM buckets").fetchone()[0]
+        finally:
+            conn.close()
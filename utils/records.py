@@ -0,0 +1,362 @@
+# utils/records.py
+import json
+import struct
+from dataclasses import dataclass, field
+from datetime import date, datetime
+
+# Education levels, lowest to highest
+QUALIFICATION_ORDER = ["10th", "12th", "Diploma", "UG (Bachelor's)", "PG (Master's)"]
+MARITAL_STATUSES = ["Single", "Married"]
+MIN_EDUCATION_YEAR = 1980
+
+# JSON format version (first element of every serialized record)
+_FORMAT_VERSION = 1
+# Binary format version (first byte of every packed record); strings are
+# prefixed with their varint-encoded length
+_PACK_VERSION = 2
+
+_HEADER = struct.Struct("<BIBB")  # version, dob ordinal, married flag, highest level
+_EDUCATION = struct.Struct("<BH")  # level index, year
+_DATES = struct.Struct("<II")  # start/end date ordinals
+_COUNT = struct.Struct("<B")
+
+
+@dataclass(slots=True)
+class Education:
+    level: str
+    institution: str
+    year: int
+    specialization: str = ""
+
+
+@dataclass(slots=True)
+class WorkExperience:
+    company: str
+    position: str
+    start_date: date
+    end_date: date
+    responsibilities: str = ""
+
+
+@dataclass(slots=True)
+class Person:
+    name: str
+    phone: str
+    dob: date
+    is_married: str
+    father_name: str
+    husband_name: str
+    highest_qualification: str
+    education: list = field(default_factory=list)
+    work_experience: list = field(default_factory=list)
+
+    def validate(self):
+        """
+        Check the record against the CV rules, shared by the form and the bulk importer
+
+        Returns:
+            list: Validation error messages, empty if the record is valid
+        """
+
+        errors = []
+
+        if not all([self.name, self.phone, self.father_name]):
+            errors.append("Please fill in all required fields marked with *")
+
+        if self.is_married not in MARITAL_STATUSES:
+            errors.append(f"Invalid marital status: {self.is_married}")
+        elif self.is_married == "Married" and not self.husband_name:
+            errors.append("Please enter husband's name")
+
+        if self.highest_qualification not in QUALIFICATION_ORDER:
+            errors.append(f"Invalid qualification: {self.highest_qualification}")
+
+        if not self.education:
+            errors.append("Please fill in education details")
+
+        current_year = datetime.now().year
+        for edu in self.education:
+            if edu.level not in QUALIFICATION_ORDER:
+                errors.append(f"Invalid education level: {edu.level}")
+            if not edu.institution:
+                errors.append(f"Missing institution for {edu.level}")
+            if not MIN_EDUCATION_YEAR <= edu.year <= current_year:
+                errors.append(f"Invalid year of completion for {edu.level}: {edu.year}")
+
+        for exp in self.work_experience:
+            if not (exp.company and exp.position):
+                errors.append("Work experience requires company and position")
+
+        return errors
+
+    def to_user_data(self):
+        """
+        Convert the record to the user_data dict used by generate_cv_pdf
+
+        Returns:
+            dict: user_data dictionary
+        """
+
+        return {
+            'name': self.name,
+            'phone': self.phone,
+            'dob': self.dob,
+            'is_married': self.is_married,
+            'father_name': self.father_name,
+            'husband_name': self.husband_name,
+            'highest_qualification': self.highest_qualification,
+            'education': {
+                edu.level: {
+                    'institution': edu.institution,
+                    'year': edu.year,
+                    'specialization': edu.specialization
+                }
+                for edu in self.education
+            },
+            'work_experience': [
+                {
+                    'company': exp.company,
+                    'position': exp.position,
+                    'start_date': exp.start_date,
+                    'end_date': exp.end_date,
+                    'responsibilities': exp.responsibilities
+                }
+                for exp in self.work_experience
+            ]
+        }
+
+
+def from_user_data(user_data, validate=True):
+    """
+    Build a Person record from a user_data dict
+
+    Args:
+        user_data (dict): Data as returned by collect_user_data
+        validate (bool): Raise ValueError if the record is invalid
+
+    Returns:
+        Person: The typed record
+    """
+
+    education = [
+        Education(
+            level,
+            details['institution'],
+            int(details['year']),
+            details.get('specialization') or ""
+        )
+        for level, details in user_data.get('education', {}).items()
+    ]
+    work_experience = [
+        WorkExperience(
+            exp['company'],
+            exp['position'],
+            exp['start_date'],
+            exp['end_date'],
+            exp.get('responsibilities') or ""
+        )
+        for exp in user_data.get('work_experience', [])
+    ]
+
+    person = Person(
+        user_data['name'],
+        user_data['phone'],
+        user_data['dob'],
+        user_data['is_married'],
+        user_data['father_name'],
+        user_data.get('husband_name') or "",
+        user_data['highest_qualification'],
+        education,
+        work_experience
+    )
+
+    if validate:
+        errors = person.validate()
+        if errors:
+            raise ValueError("; ".join(errors))
+
+    return person
+
+
+def to_json(person):
+    """
+    Serialize a record to compact positional JSON
+
+    Args:
+        person (Person): Record to serialize
+
+    Returns:
+        str: JSON string
+    """
+
+    return json.dumps([
+        _FORMAT_VERSION,
+        person.name,
+        person.phone,
+        person.dob.toordinal(),
+        person.is_married,
+        person.father_name,
+        person.husband_name,
+        person.highest_qualification,
+        [[e.level, e.institution, e.year, e.specialization] for e in person.education],
+        [
+            [w.company, w.position, w.start_date.toordinal(), w.end_date.toordinal(), w.responsibilities]
+            for w in person.work_experience
+        ]
+    ], separators=(',', ':'), ensure_ascii=False)
+
+
+def from_json(data):
+    """
+    Deserialize a record produced by to_json
+
+    Args:
+        data (str): JSON string
+
+    Returns:
+        Person: The record
+    """
+
+    values = json.loads(data)
+    if values[0] != _FORMAT_VERSION:
+        raise ValueError(f"Unsupported record format version: {values[0]}")
+
+    return Person(
+        values[1],
+        values[2],
+        date.fromordinal(values[3]),
+        values[4],
+        values[5],
+        values[6],
+        values[7],
+        [Education(*e) for e in values[8]],
+        [
+            WorkExperience(w[0], w[1], date.fromordinal(w[2]), date.fromordinal(w[3]), w[4])
+            for w in values[9]
+        ]
+    )
+
+
+def _pack_varint(value):
+    encoded = bytearray()
+    while value >= 0x80:
+        encoded.append((value & 0x7F) | 0x80)
+        value >>= 7
+    encoded.append(value)
+    return bytes(encoded)
+
+
+def _unpack_varint(buffer, offset):
+    value = shift = 0
+    while True:
+        byte = buffer[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def _pack_str(parts, value):
+    encoded = value.encode('utf-8')
+    parts.append(_pack_varint(len(encoded)))
+    parts.append(encoded)
+
+
+def _unpack_str(buffer, offset):
+    length, offset = _unpack_varint(buffer, offset)
+    return buffer[offset:offset + length].decode('utf-8'), offset + length
+
+
+def pack(person):
+    """
+    Serialize a record to the compact binary format
+
+    Args:
+        person (Person): Record to serialize
+
+    Returns:
+        bytes: Packed record
+    """
+
+    parts = [_HEADER.pack(
+        _PACK_VERSION,
+        person.dob.toordinal(),
+        MARITAL_STATUSES.index(person.is_married),
+        QUALIFICATION_ORDER.index(person.highest_qualification)
+    )]
+
+    for value in (person.name, person.phone, person.father_name, person.husband_name):
+        _pack_str(parts, value)
+
+    parts.append(_COUNT.pack(len(person.education)))
+    for edu in person.education:
+        parts.append(_EDUCATION.pack(QUALIFICATION_ORDER.index(edu.level), edu.year))
+        _pack_str(parts, edu.institution)
+        _pack_str(parts, edu.specialization)
+
+    parts.append(_COUNT.pack(len(person.work_experience)))
+    for exp in person.work_experience:
+        parts.append(_DATES.pack(exp.start_date.toordinal(), exp.end_date.toordinal()))
+        _pack_str(parts, exp.company)
+        _pack_str(parts, exp.position)
+        _pack_str(parts, exp.responsibilities)
+
+    return b"".join(parts)
+
+
+def unpack(buffer):
+    """
+    Deserialize a record produced by pack
+
+    Args:
+        buffer (bytes): Packed record
+
+    Returns:
+        Person: The record
+    """
+
+    version, dob, married, highest = _HEADER.unpack_from(buffer, 0)
+    if version != _PACK_VERSION:
+        raise ValueError(f"Unsupported record format version: {version}")
+    offset = _HEADER.size
+
+    name, offset = _unpack_str(buffer, offset)
+    phone, offset = _unpack_str(buffer, offset)
+    father_name, offset = _unpack_str(buffer, offset)
+    husband_name, offset = _unpack_str(buffer, offset)
+
+    (count,) = _COUNT.unpack_from(buffer, offset)
+    offset += _COUNT.size
+    education = []
+    for _ in range(count):
+        level, year = _EDUCATION.unpack_from(buffer, offset)
+        offset += _EDUCATION.size
+        institution, offset = _unpack_str(buffer, offset)
+        specialization, offset = _unpack_str(buffer, offset)
+        education.append(Education(QUALIFICATION_ORDER[level], institution, year, specialization))
+
+    (count,) = _COUNT.unpack_from(buffer, offset)
+    offset += _COUNT.size
+    work_experience = []
+    for _ in range(count):
+        start, end = _DATES.unpack_from(buffer, offset)
+        offset += _DATES.size
+        company, offset = _unpack_str(buffer, offset)
+        position, offset = _unpack_str(buffer, offset)
+        responsibilities, offset = _unpack_str(buffer, offset)
+        work_experience.append(WorkExperience(
+            company, position, date.fromordinal(start), date.fromordinal(end), responsibilities
+        ))
+
+    return Person(
+        name,
+        phone,
+        date.fromordinal(dob),
+        MARITAL_STATUSES[married],
+        father_name,
+        husband_name,
+        QUALIFICATION_ORDER[highest],
+        education,
+        work_experience
+    )
@@ -0,0 +1,189 @@
+# utils/renderers.py
+import html
+import os
+import uuid
+from utils.cv_generator import build_cv_document
+from utils.cv_model import build_cv_model, EDUCATION_HEADER
+
+_HTML_STYLE = """
+body { font-family: Helvetica, Arial, sans-serif; max-width: 7in; margin: 0.75in auto; font-size: 11pt; }
+h1 { text-align: center; color: darkblue; font-size: 20pt; }
+h2 { color: darkblue; background: lightgrey; border: 1px solid darkblue; padding: 5px; font-size: 14pt; }
+table { border-collapse: collapse; width: 100%; }
+td, th { border: 1px solid black; padding: 4px; }
+th { background: darkblue; color: whitesmoke; }
+tr:nth-child(even) td { background: lightgrey; }
+.education td, .education th { text-align: center; }
+.footer { text-align: center; color: grey; font-size: 9pt; margin-top: 30px; }
+"""
+
+
+def render_pdf(model, output_path, reproducible=False, **options):
+    """
+    Render the CV model as PDF
+
+    Args:
+        model (CVDocument): CV document model
+        output_path (str): Path for the PDF file
+        reproducible (bool): Use fixed PDF dates and document ID
+        **options: Options for other renderers, ignored
+
+    Returns:
+        str: Path to the PDF file
+    """
+
+    build_cv_document(output_path, model, reproducible=reproducible)
+    return output_path
+
+
+def render_html(model, output_path, **options):
+    """
+    Render the CV model as a standalone HTML page
+
+    Args:
+        model (CVDocument): CV document model
+        output_path (str): Path for the HTML file
+        **options: Options for other renderers, ignored
+
+    Returns:
+        str: Path to the HTML file
+    """
+
+    esc = html.escape
+    parts = [
+        "<!DOCTYPE html>",
+        f"<html><head><meta charset=\"utf-8\"><title>CV - {esc(model.name)}</title>",
+        f"<style>{_HTML_STYLE}</style></head><body>",
+        f"<h1>{esc(model.name.upper())}</h1>",
+        "<h2>PERSONAL INFORMATION</h2><table>",
+    ]
+    for label, value in model.personal_info:
+        parts.append(f"<tr><td><b>{esc(label)}</b></td><td>{esc(value)}</td></tr>")
+    parts.append("</table>")
+
+    parts.append("<h2>EDUCATIONAL QUALIFICATIONS</h2><table class=\"education\"><tr>")
+    parts.extend(f"<th>{esc(heading)}</th>" for heading in EDUCATION_HEADER)
+    parts.append("</tr>")
+    for row in model.education_rows:
+        parts.append("<tr>" + "".join(f"<td>{esc(cell)}</td>" for cell in row) + "</tr>")
+    parts.append("</table>")
+
+    if model.experience:
+        parts.append("<h2>WORK EXPERIENCE</h2>")
+        for exp in model.experience:
+            parts.append(f"<p><b>{esc(exp.position)}</b> at <b>{esc(exp.company)}</b></p>")
+            parts.append(f"<p>Duration: {esc(exp.duration)}</p>")
+            if exp.responsibilities:
+                parts.append("<p><b>Key Responsibilities:</b></p>")
+                parts.append(f"<p>{esc(exp.responsibilities)}</p>")
+
+    parts.append(f"<p class=\"footer\">{esc(model.footer)}</p></body></html>")
+
+    with open(output_path, 'w', encoding='utf-8') as file:
+        file.write("\n".join(parts))
+    return output_path
+
+
+def render_docx(model, output_path, **options):
+    """
+    Render the CV model as a Word document
+
+    Args:
+        model (CVDocument): CV document model
+        output_path (str): Path for the DOCX file
+        **options: Options for other renderers, ignored
+
+    Returns:
+        str: Path to the DOCX file
+    """
+
+    import docx
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    from docx.shared import Pt, RGBColor
+
+    document = docx.Document()
+
+    title = document.add_heading(model.name.upper(), level=0)
+    title.alignment = WD_ALIGN_PARAGRAPH.CENTER
+
+    document.add_heading("PERSONAL INFORMATION", level=1)
+    table = document.add_table(rows=0, cols=2)
+    table.style = "Table Grid"
+    for label, value in model.personal_info:
+        cells = table.add_row().cells
+        cells[0].paragraphs[0].add_run(label).bold = True
+        cells[1].text = value
+
+    document.add_heading("EDUCATIONAL QUALIFICATIONS", level=1)
+    table = document.add_table(rows=1, cols=len(EDUCATION_HEADER))
+    table.style = "Table Grid"
+    for cell, heading in zip(table.rows[0].cells, EDUCATION_HEADER):
+        cell.paragraphs[0].add_run(heading).bold = True
+    for row in model.education_rows:
+        for cell, value in zip(table.add_row().cells, row):
+            cell.text = value
+
+    if model.experience:
+        document.add_heading("WORK EXPERIENCE", level=1)
+        for exp in model.experience:
+            paragraph = document.add_paragraph()
+            paragraph.add_run(exp.position).bold = True
+            paragraph.add_run(" at ")
+            paragraph.add_run(exp.company).bold = True
+            document.add_paragraph(f"Duration: {exp.duration}")
+            if exp.responsibilities:
+                document.add_paragraph().add_run("Key Responsibilities:").bold = True
+                document.add_paragraph(exp.responsibilities)
+
+    footer = document.add_paragraph()
+    footer.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    run = footer.add_run(model.footer)
+    run.font.size = Pt(9)
+    run.font.color.rgb = RGBColor(0x80, 0x80, 0x80)
+
+    document.save(output_path)
+    return output_path
+
+
+# Format name -> renderer(model, output_path, **options); every renderer
+# receives all options and ignores the ones it does not use
+RENDERERS = {
+    "pdf": render_pdf,
+    "docx": render_docx,
+    "html": render_html,
+}
+
+
+def render_formats(user_data, output_dir, formats=("pdf", "docx", "html"), generated_on=None,
+                   **options):
+    """
+    Build the CV model once and render it to several formats
+
+    The renderers are pure-Python and CPU-bound, so they run one after
+    another; each takes milliseconds, less than starting worker processes.
+
+    Args:
+        user_data (dict): CV data
+        output_dir (str): Directory for the generated files
+        formats (iterable): Format names from RENDERERS
+        generated_on (date): Date printed in the footer, today if None
+        **options: Passed to every renderer, e.g. reproducible=True for
+            fixed PDF dates and document ID
+
+    Returns:
+        dict: format -> path of the rendered file
+    """
+
+    unknown = set(formats) - set(RENDERERS)
+    if unknown:
+        raise ValueError(f"Unsupported output formats: {', '.join(sorted(unknown))}")
+
+    os.makedirs(output_dir, exist_ok=True)
+    model = build_cv_model(user_data, generated_on)
+    stem = f"cv_temp_{uuid.uuid4().hex[:12]}"
+
+    outputs = {}
+    for output_format in formats:
+        output_path = os.path.join(output_dir, f"{stem}.{output_format}")
+        outputs[output_format] = RENDERERS[output_format](model, output_path, **options)
+    return outputs
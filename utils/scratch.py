@@ -0,0 +1,197 @@
+# utils/scratch.py
+import os
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+# Total size allowed for the scratch directories of one process
+SCRATCH_QUOTA = 512 * 1024 * 1024  # 512MB
+# Scratch directories older than this are treated as orphans
+ORPHAN_MAX_AGE = 60 * 60  # 1 hour
+JANITOR_INTERVAL = 5 * 60  # 5 minutes
+
+_SCRATCH_PREFIX = "req_"
+_janitor_lock = threading.Lock()
+_janitor_thread = None
+_janitor_tasks = []
+
+# Bytes used by each live scratch directory of this process, as last measured
+_usage = {}
+_usage_lock = threading.Lock()
+
+
+class ScratchQuotaExceeded(Exception):
+    """Raised when scratch space is full"""
+
+
+def get_scratch_root():
+    """
+    Get the directory that holds per-request scratch directories
+
+    Uses tmpfs (/dev/shm) when available so temporary PDFs never touch disk,
+    otherwise the local temp/ directory.
+
+    Returns:
+        str: Scratch root path
+    """
+
+    if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK):
+        root = os.path.join("/dev/shm", "cv_generator")
+    else:
+        root = "temp"
+    os.makedirs(root, exist_ok=True)
+    return root
+
+
+def _dir_size(path):
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for filename in filenames:
+            try:
+                total += os.path.getsize(os.path.join(dirpath, filename))
+            except OSError:
+                pass
+    return total
+
+
+def reap_orphans(root=None, max_age=ORPHAN_MAX_AGE):
+    """
+    Remove scratch directories left behind by crashed or abandoned requests
+
+    Args:
+        root (str): Scratch root, default from get_scratch_root()
+        max_age (float): Minimum age in seconds of directories to remove
+
+    Returns:
+        int: Number of directories removed
+    """
+
+    root = root or get_scratch_root()
+    cutoff = time.time() - max_age
+    removed = 0
+
+    for entry in os.scandir(root):
+        if not (entry.name.startswith(_SCRATCH_PREFIX) and entry.is_dir()):
+            continue
+        try:
+            if entry.stat().st_mtime < cutoff:
+                shutil.rmtree(entry.path, ignore_errors=True)
+                removed += 1
+        except OSError:
+            pass
+
+    return removed
+
+
+def scratch_usage():
+    """
+    Get the bytes used by this process's live scratch directories
+
+    Returns:
+        int: Total of the last measured sizes
+    """
+
+    with _usage_lock:
+        return sum(_usage.values())
+
+
+def check_scratch_quota(path, quota=SCRATCH_QUOTA):
+    """
+    Measure a scratch directory after writing to it and enforce the quota
+
+    Only this directory is walked; the others count with their last measured size.
+
+    Args:
+        path (str): Scratch directory from scratch_dir()
+        quota (int): Maximum total bytes of this process's scratch directories
+
+    Raises:
+        ScratchQuotaExceeded: If the scratch directories now exceed the quota
+    """
+
+    size = _dir_size(path)
+    with _usage_lock:
+        _usage[path] = size
+        total = sum(_usage.values())
+    if total > quota:
+        raise ScratchQuotaExceeded("Temporary storage is full, please try again later")
+
+
+@contextmanager
+def scratch_dir(quota=SCRATCH_QUOTA):
+    """
+    Create a unique scratch directory for one request, removed on exit
+
+    Call check_scratch_quota() after writing large files into it.
+
+    Args:
+        quota (int): Maximum total bytes of this process's scratch directories
+
+    Yields:
+        str: Path of the scratch directory
+
+    Raises:
+        ScratchQuotaExceeded: If the quota is already used up
+    """
+
+    if scratch_usage() >= quota:
+        raise ScratchQuotaExceeded("Temporary storage is full, please try again later")
+
+    path = tempfile.mkdtemp(prefix=_SCRATCH_PREFIX, dir=get_scratch_root())
+    with _usage_lock:
+        _usage[path] = 0
+    try:
+        yield path
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+        with _usage_lock:
+            _usage.pop(path, None)
+
+
+def _sweep(max_age):
+    try:
+        reap_orphans(max_age=max_age)
+    except Exception as e:
+        print(f"Error reaping scratch directories: {e}")
+    with _janitor_lock:
+        tasks = list(_janitor_tasks)
+    for task in tasks:
+        try:
+            task()
+        except Exception as e:
+            print(f"Error running janitor task: {e}")
+
+
+def _janitor_loop(interval, max_age):
+    while True:
+        time.sleep(interval)
+        _sweep(max_age)
+
+
+def start_janitor(interval=JANITOR_INTERVAL, max_age=ORPHAN_MAX_AGE, tasks=()):
+    """
+    Start the background thread that reaps orphaned scratch directories
+
+    Safe to call on every run; only one janitor is started per process, with
+    the interval and max_age of the first call. Tasks from every call are
+    added to it (each at most once).
+
+    Args:
+        interval (float): Seconds between sweeps
+        max_age (float): Minimum age in seconds of directories to remove
+        tasks (iterable): Extra cleanup callables run on every sweep, e.g.
+            SessionStore.purge_expired
+    """
+
+    global _janitor_thread
+    with _janitor_lock:
+        for task in tasks:
+            if task not in _janitor_tasks:
+                _janitor_tasks.append(task)
+        if _janitor_thread is None or not _janitor_thread.is_alive():
+            _janitor_thread = threading.Thread(
+                target=_janitor_loop, args=(interval, max_age), name="scratch-janitor", daemon=True
+            )
+            _janitor_thread.start()
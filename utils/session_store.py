@@ -0,0 +1,159 @@
+# utils/session_store.py
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from utils.records import from_user_data, to_json, from_json
+
+# Sessions idle for longer than this are dropped
+SESSION_TTL = 12 * 60 * 60  # 12 hours
+DEFAULT_STORE_PATH = os.path.join("data", "sessions.db")
+
+
+class SessionStore:
+    """
+    Wizard state (step, user_data) keyed by session id
+
+    Replicas can resume each other's sessions when they share a store. To
+    share sessions across hosts, implement this interface on a networked
+    store and return it from get_session_store() in app.py.
+    """
+
+    def save(self, session_id, state):
+        """
+        Save the wizard state for a session
+
+        Args:
+            session_id (str): Session identifier
+            state (dict): {'step': int, 'user_data': dict}
+        """
+
+        raise NotImplementedError
+
+    def load(self, session_id):
+        """
+        Load the wizard state for a session
+
+        Args:
+            session_id (str): Session identifier
+
+        Returns:
+            dict: {'step': int, 'user_data': dict}, None if missing or expired
+        """
+
+        raise NotImplementedError
+
+    def exists(self, session_id):
+        """
+        Check whether a session is live (saved, not expired and not deleted)
+
+        Args:
+            session_id (str): Session identifier
+
+        Returns:
+            bool: True if the session exists
+        """
+
+        raise NotImplementedError
+
+    def delete(self, session_id):
+        """Remove a session"""
+
+        raise NotImplementedError
+
+    def purge_expired(self):
+        """
+        Remove expired sessions
+
+        Stores that expire entries themselves need not override this.
+
+        Returns:
+            int: Number of sessions removed
+        """
+
+        return 0
+
+    @staticmethod
+    def encode_state(state):
+        """Serialize wizard state to a string, keeping dates through the record model"""
+
+        user_data = state.get('user_data')
+        return json.dumps({
+            'step': state.get('step', 1),
+            'user_data': to_json(from_user_data(user_data, validate=False)) if user_data else None
+        })
+
+    @staticmethod
+    def decode_state(data):
+        """Deserialize wizard state produced by encode_state"""
+
+        data = json.loads(data)
+        return {
+            'step': data['step'],
+            'user_data': from_json(data['user_data']).to_user_data() if data['user_data'] else {}
+        }
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    Session store in a SQLite file
+
+    The file uses WAL journaling, which needs shared memory between the
+    processes using it, so it only works for processes on one host; do not
+    put it on a network filesystem to share it between hosts.
+    """
+
+    def __init__(self, db_path=DEFAULT_STORE_PATH, ttl=SESSION_TTL):
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.db_path = db_path
+        self.ttl = ttl
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions "
+                "(session_id TEXT PRIMARY KEY, data TEXT NOT NULL, expires REAL NOT NULL)"
+            )
+
+    @contextmanager
+    def _connect(self):
+        # Commit on success, roll back on error, and always close the connection
+        conn = sqlite3.connect(self.db_path, timeout=5)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def save(self, session_id, state):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO sessions (session_id, data, expires) VALUES (?, ?, ?)",
+                (session_id, self.encode_state(state), time.time() + self.ttl)
+            )
+
+    def load(self, session_id):
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT data FROM sessions WHERE session_id = ? AND expires > ?",
+                (session_id, time.time())
+            ).fetchone()
+        return self.decode_state(row[0]) if row else None
+
+    def exists(self, session_id):
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT 1 FROM sessions WHERE session_id = ? AND expires > ?",
+                (session_id, time.time())
+            ).fetchone()
+        return row is not None
+
+    def delete(self, session_id):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+
+    def purge_expired(self):
+        with self._connect() as conn:
+            return conn.execute("DELETE FROM sessions WHERE expires <= ?", (time.time(),)).rowcount
@@ -0,0 +1,317 @@
+# utils/storage.py
+import hashlib
+import os
+import shutil
+import sqlite3
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+
+# Multipart settings for object stores
+MULTIPART_THRESHOLD = 8 * 1024 * 1024  # 8MB
+MULTIPART_CHUNK_SIZE = 8 * 1024 * 1024  # 8MB
+
+
+# Folder layouts under the configured base folder; {hash} is a prefix of the filename hash
+FOLDER_LAYOUTS = {
+    "flat": "",
+    "date": "{year}/{month}",
+    "date_hash": "{year}/{month}/{hash}",
+}
+HASH_PREFIX_LENGTH = 2
+
+
+def shard_folder(base_folder, filename, layout="flat", when=None):
+    """
+    Build the sharded destination folder for a file
+
+    Args:
+        base_folder (str): Base folder path, e.g. "/CVs"
+        filename (str): Destination file name (used for the hash prefix)
+        layout (str): Key of FOLDER_LAYOUTS, or a custom template using
+            {year}, {month}, {day} and {hash}
+        when (datetime): Date used for the date components, now if None
+
+    Returns:
+        str: Folder path, e.g. "/CVs/2026/10/3f"
+    """
+
+    template = FOLDER_LAYOUTS.get(layout, layout)
+    if not template:
+        return base_folder
+
+    when = when or datetime.now()
+    shard = template.format(
+        year=f"{when.year:04d}",
+        month=f"{when.month:02d}",
+        day=f"{when.day:02d}",
+        hash=hashlib.sha1(filename.encode()).hexdigest()[:HASH_PREFIX_LENGTH]
+    )
+    return f"{base_folder.rstrip('/')}/{shard}"
+
+
+class StorageBackend:
+    """Base class for places generated CVs can be stored"""
+
+    name = "storage"
+
+    @property
+    def identity(self):
+        """
+        Identifies where files go (account, bucket, root directory), so that
+        two backends of the same kind are not mistaken for each other
+        """
+
+        return self.name
+
+    def put_fileobj(self, fileobj, folder, filename):
+        """
+        Stream a file-like object to storage
+
+        Args:
+            fileobj: Readable binary file object
+            folder (str): Destination folder path
+            filename (str): Destination file name
+
+        Returns:
+            bool: True if upload successful, False otherwise
+        """
+
+        raise NotImplementedError
+
+    def put_file(self, local_file_path, folder, filename):
+        """
+        Upload a local file to storage
+
+        Args:
+            local_file_path (str): Path to the local file
+            folder (str): Destination folder path
+            filename (str): Destination file name
+
+        Returns:
+            bool: True if upload successful, False otherwise
+        """
+
+        with open(local_file_path, 'rb') as file:
+            return self.put_fileobj(file, folder, filename)
+
+    def ensure_folders(self, folders):
+        """
+        Make sure folders exist before uploading into them
+
+        Backends whose uploads create folders implicitly need not override this.
+
+        Args:
+            folders (iterable): Folder paths
+
+        Returns:
+            bool: True if all folders exist, False otherwise
+        """
+
+        return True
+
+    def put_many(self, items, max_workers=8):
+        """
+        Upload several local files concurrently
+
+        Args:
+            items (iterable): (local_file_path, folder, filename) tuples
+            max_workers (int): Number of concurrent uploads
+
+        Returns:
+            list: Upload result (bool) for each item, in order
+        """
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(lambda item: self.put_file(*item), items))
+
+
+class LocalStorage(StorageBackend):
+    """Store files under a directory on the local filesystem"""
+
+    name = "local"
+
+    def __init__(self, root):
+        self.root = root
+
+    @property
+    def identity(self):
+        return f"{self.name}:{os.path.realpath(self.root)}"
+
+    def _path(self, folder, filename):
+        # Folder and filename come from user input; never write outside the root
+        root = os.path.realpath(self.root)
+        path = os.path.realpath(os.path.join(root, folder.strip('/'), filename))
+        if os.path.commonpath([root, path]) != root or path == root:
+            raise ValueError(f"Destination {folder}/{filename} is outside the storage root")
+        return path
+
+    def put_fileobj(self, fileobj, folder, filename):
+        try:
+            path = self._path(folder, filename)
+            directory = os.path.dirname(path)
+            os.makedirs(directory, exist_ok=True)
+
+            # Write to a temporary file first so readers never see partial files
+            fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".upload_")
+            try:
+                with os.fdopen(fd, 'wb') as output_file:
+                    shutil.copyfileobj(fileobj, output_file, MULTIPART_CHUNK_SIZE)
+                os.replace(temp_path, path)
+            except BaseException:
+                os.remove(temp_path)
+                raise
+            return True
+
+        except Exception as e:
+            print(f"Error storing file locally: {e}")
+            return False
+
+
+class S3Storage(StorageBackend):
+    """Store files in an S3-compatible object store (AWS S3, MinIO, ...)"""
+
+    name = "s3"
+
+    def __init__(self, bucket, endpoint_url=None, access_key=None, secret_key=None,
+                 region=None, max_concurrency=10):
+        """
+        Args:
+            bucket (str): Bucket name
+            endpoint_url (str): Endpoint for S3-compatible stores, None for AWS
+            access_key (str): Access key ID, None to use the default credential chain
+            secret_key (str): Secret access key
+            region (str): Region name
+            max_concurrency (int): Parallel part uploads for multipart transfers
+        """
+
+        import boto3
+        from boto3.s3.transfer import TransferConfig
+
+        self.bucket = bucket
+        self.endpoint_url = endpoint_url
+        self.client = boto3.client(
+            's3',
+            endpoint_url=endpoint_url,
+            aws_access_key_id=access_key,
+            aws_secret_access_key=secret_key,
+            region_name=region
+        )
+        # Files above the threshold are sent as parallel multipart uploads
+        self.transfer_config = TransferConfig(
+            multipart_threshold=MULTIPART_THRESHOLD,
+            multipart_chunksize=MULTIPART_CHUNK_SIZE,
+            max_concurrency=max_concurrency
+        )
+
+    @property
+    def identity(self):
+        return f"{self.name}:{self.endpoint_url or 'aws'}/{self.bucket}"
+
+    def _key(self, folder, filename):
+        folder = folder.strip('/')
+        return f"{folder}/{filename}" if folder else filename
+
+    def put_fileobj(self, fileobj, folder, filename):
+        try:
+            self.client.upload_fileobj(
+                fileobj, self.bucket, self._key(folder, filename), Config=self.transfer_config
+            )
+            return True
+
+        except Exception as e:
+            print(f"Error uploading to object store: {e}")
+            return False
+
+    def put_file(self, local_file_path, folder, filename):
+        try:
+            self.client.upload_file(
+                local_file_path, self.bucket, self._key(folder, filename), Config=self.transfer_config
+            )
+            return True
+
+        except Exception as e:
+            print(f"Error uploading to object store: {e}")
+            return False
+
+
+class DedupStorage(StorageBackend):
+    """
+    Wrap a backend and skip uploads whose content is already stored
+
+    A SQLite index maps each destination path to the content hash last
+    uploaded there. Pass the hash of the reproducible (unencrypted) PDF,
+    combined with the encryption policy fingerprint, as content_hash, since
+    encryption adds random IDs to the final bytes.
+    """
+
+    def __init__(self, backend, index_path):
+        self.backend = backend
+        self.name = backend.name
+        self.index_path = index_path
+        directory = os.path.dirname(index_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS uploads (path TEXT PRIMARY KEY, content_hash TEXT NOT NULL)"
+            )
+
+    @property
+    def identity(self):
+        return self.backend.identity
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.index_path, timeout=5)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _index_key(self, folder, filename):
+        return f"{self.backend.identity}|{folder.strip('/')}/{filename}"
+
+    def is_stored(self, folder, filename, content_hash):
+        """
+        Check whether content with this hash was already uploaded to the path
+
+        Returns:
+            bool: True if the stored file has the same content hash
+        """
+
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT content_hash FROM uploads WHERE path = ?", (self._index_key(folder, filename),)
+            ).fetchone()
+        return row is not None and row[0] == content_hash
+
+    def _record(self, folder, filename, content_hash):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO uploads (path, content_hash) VALUES (?, ?)",
+                (self._index_key(folder, filename), content_hash)
+            )
+
+    def put_file(self, local_file_path, folder, filename, content_hash=None):
+        if content_hash is None:
+            digest = hashlib.sha256()
+            with open(local_file_path, 'rb') as file:
+                for block in iter(lambda: file.read(MULTIPART_CHUNK_SIZE), b""):
+                    digest.update(block)
+            content_hash = digest.hexdigest()
+        if self.is_stored(folder, filename, content_hash):
+            return True
+
+        success = self.backend.put_file(local_file_path, folder, filename)
+        if success:
+            self._record(folder, filename, content_hash)
+        return success
+
+    def put_fileobj(self, fileobj, folder, filename):
+        return self.backend.put_fileobj(fileobj, folder, filename)
+
+    def ensure_folders(self, folders):
+        return self.backend.ensure_folders(folders)